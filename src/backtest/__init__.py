@@ -3,19 +3,39 @@ PR3DICT Backtesting Framework
 
 Simulate strategies against historical data to validate performance
 before deploying to live markets.
+
+Public names are imported lazily on first access, so running
+``python -m src.backtest.run --help`` doesn't load the engine,
+strategies or NumPy-heavy modules.
 """
-from .engine import BacktestEngine, BacktestConfig
-from .data import HistoricalDataLoader, MarketSnapshot
-from .metrics import PerformanceMetrics, calculate_metrics
-from .report import BacktestReport, generate_report
-
-__all__ = [
-    'BacktestEngine',
-    'BacktestConfig',
-    'HistoricalDataLoader',
-    'MarketSnapshot',
-    'PerformanceMetrics',
-    'calculate_metrics',
-    'BacktestReport',
-    'generate_report',
-]
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'BacktestEngine': '.engine',
+    'BacktestConfig': '.engine',
+    'HistoricalDataLoader': '.data',
+    'MarketSnapshot': '.data',
+    'EquityCurve': '.equity',
+    'PerformanceMetrics': '.metrics',
+    'calculate_metrics': '.metrics',
+    'BacktestReport': '.report',
+    'generate_report': '.report',
+    'run_sweep': '.sweep',
+    'run_strategies': '.sweep',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
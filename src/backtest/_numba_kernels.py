@@ -0,0 +1,56 @@
+"""
+Numba Kernels for Backtest Metrics
+
+Compiled inner loops for metrics that don't reduce to a single NumPy
+expression. Falls back to plain Python when Numba isn't installed.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    logger.debug("Numba not installed - backtest kernels run uncompiled")
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def max_drawdown_kernel(equity: np.ndarray):
+    """
+    Single-pass peak tracking over an equity series.
+    
+    Args:
+        equity: float64 array of equity values in time order
+        
+    Returns:
+        (max_drawdown, peak_index, trough_index)
+    """
+    max_dd = 0.0
+    peak = equity[0]
+    peak_idx = 0
+    dd_peak_idx = 0
+    dd_trough_idx = 0
+    
+    for i in range(equity.shape[0]):
+        value = equity[i]
+        if value > peak:
+            peak = value
+            peak_idx = i
+        else:
+            dd = (peak - value) / peak
+            if dd > max_dd:
+                max_dd = dd
+                dd_peak_idx = peak_idx
+                dd_trough_idx = i
+    
+    return max_dd, dd_peak_idx, dd_trough_idx
@@ -6,9 +6,10 @@ to simulate real-time market conditions without look-ahead bias.
 """
 import csv
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Iterator
+from typing import List, Optional, Dict, Iterator, Set
 from decimal import Decimal
 from pathlib import Path
 
@@ -16,6 +17,19 @@ from ..platforms.base import Market, OrderBook
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Columns persisted in Parquet snapshot files
+PARQUET_COLUMNS = [
+    'timestamp', 'market_id', 'ticker', 'title', 'yes_price', 'no_price',
+    'volume', 'liquidity', 'close_time', 'resolved', 'platform'
+]
+
 
 @dataclass
 class MarketSnapshot:
@@ -68,6 +82,7 @@ class HistoricalDataLoader:
     
     Supports:
     - CSV files with timestamped snapshots
+    - Parquet files with date-range predicate pushdown (requires pyarrow)
     - API-fetched historical data
     - Chronological replay with no look-ahead bias
     """
@@ -76,6 +91,10 @@ class HistoricalDataLoader:
         self.data_dir = data_dir or Path.home() / ".openclaw/workspace/pr3dict/data/historical"
         self.snapshots: List[MarketSnapshot] = []
         self._loaded = False
+        
+        # Lazy market_id -> (timestamps, snapshots) index for point lookups
+        self._market_index: Optional[Dict[str, tuple[List[datetime], List[MarketSnapshot]]]] = None
+        self._market_index_source: Optional[tuple[int, int]] = None
     
     def load_csv(self, filepath: Path) -> None:
         """
@@ -118,10 +137,89 @@ class HistoricalDataLoader:
         if self.snapshots:
             logger.info(f"Date range: {self.snapshots[0].timestamp} to {self.snapshots[-1].timestamp}")
     
+    def load_parquet(self, filepath: Path,
+                     start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None) -> None:
+        """
+        Load market snapshots from a Parquet file.
+        
+        Only the snapshot columns are read, and the date range is pushed
+        down to the reader so row groups outside it are never decoded.
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required for Parquet data. Install with: pip install pyarrow")
+        
+        logger.info(f"Loading historical data from {filepath}")
+        
+        if not filepath.exists():
+            raise FileNotFoundError(f"Historical data file not found: {filepath}")
+        
+        filters = []
+        if start_date is not None:
+            filters.append(('timestamp', '>=', start_date))
+        if end_date is not None:
+            filters.append(('timestamp', '<=', end_date))
+        
+        table = pq.read_table(filepath, columns=PARQUET_COLUMNS, filters=filters or None)
+        columns = {name: table.column(name).to_pylist() for name in PARQUET_COLUMNS}
+        
+        for (timestamp, market_id, ticker, title, yes_price, no_price,
+             volume, liquidity, close_time, resolved, platform) in zip(
+                *(columns[name] for name in PARQUET_COLUMNS)):
+            self.snapshots.append(MarketSnapshot(
+                timestamp=timestamp,
+                market_id=market_id,
+                ticker=ticker,
+                title=title,
+                yes_price=Decimal(str(yes_price)),
+                no_price=Decimal(str(no_price)),
+                volume=Decimal(str(volume)),
+                liquidity=Decimal(str(liquidity)),
+                close_time=close_time,
+                resolved=resolved,
+                platform=platform
+            ))
+        
+        # Sort by timestamp to ensure chronological replay
+        self.snapshots.sort(key=lambda s: s.timestamp)
+        self._loaded = True
+        
+        logger.info(f"Loaded {table.num_rows} market snapshots")
+    
+    def save_parquet(self, filepath: Path) -> None:
+        """
+        Save loaded snapshots to a Parquet file.
+        
+        Repeated string columns are dictionary-encoded and prices are
+        stored as float64.
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required for Parquet data. Install with: pip install pyarrow")
+        
+        snapshots = self.snapshots
+        table = pa.table({
+            'timestamp': pa.array([s.timestamp for s in snapshots], pa.timestamp('us')),
+            'market_id': pa.array([s.market_id for s in snapshots]).dictionary_encode(),
+            'ticker': pa.array([s.ticker for s in snapshots]).dictionary_encode(),
+            'title': pa.array([s.title for s in snapshots]).dictionary_encode(),
+            'yes_price': pa.array([float(s.yes_price) for s in snapshots], pa.float64()),
+            'no_price': pa.array([float(s.no_price) for s in snapshots], pa.float64()),
+            'volume': pa.array([float(s.volume) for s in snapshots], pa.float64()),
+            'liquidity': pa.array([float(s.liquidity) for s in snapshots], pa.float64()),
+            'close_time': pa.array([s.close_time for s in snapshots], pa.timestamp('us')),
+            'resolved': pa.array([s.resolved for s in snapshots], pa.bool_()),
+            'platform': pa.array([s.platform for s in snapshots]).dictionary_encode(),
+        })
+        
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, filepath)
+        
+        logger.info(f"Saved {len(snapshots)} snapshots to {filepath}")
+    
     def load_from_directory(self, start_date: datetime, end_date: datetime, 
                            platforms: Optional[List[str]] = None) -> None:
         """
-        Load all CSV files in data directory within date range.
+        Load all CSV and Parquet files in data directory within date range.
         
         Args:
             start_date: Begin date for backtest
@@ -133,15 +231,25 @@ class HistoricalDataLoader:
             return
         
         csv_files = list(self.data_dir.glob("*.csv"))
-        logger.info(f"Found {len(csv_files)} CSV files in {self.data_dir}")
+        parquet_files = list(self.data_dir.glob("*.parquet"))
+        if parquet_files and not HAS_PYARROW:
+            # Fail before loading anything rather than backtest on partial data
+            raise ImportError(
+                f"pyarrow is required for the {len(parquet_files)} Parquet files in {self.data_dir}. "
+                "Install with: pip install pyarrow"
+            )
+        logger.info(f"Found {len(csv_files)} CSV and {len(parquet_files)} Parquet files in {self.data_dir}")
         
-        for csv_file in csv_files:
+        for data_file in csv_files + parquet_files:
             # Optional platform filtering based on filename
             if platforms:
-                if not any(p in csv_file.stem for p in platforms):
+                if not any(p in data_file.stem for p in platforms):
                     continue
             
-            self.load_csv(csv_file)
+            if data_file.suffix == ".parquet":
+                self.load_parquet(data_file, start_date, end_date)
+            else:
+                self.load_csv(data_file)
         
         # Filter to date range
         self.snapshots = [
@@ -234,6 +342,20 @@ class HistoricalDataLoader:
         Yields:
             (timestamp, markets): Tuple of timestamp and available markets at that time
         """
+        for timestamp, markets, _ in self.replay_with_changes(start_date, end_date):
+            yield timestamp, markets
+    
+    def replay_with_changes(self, start_date: datetime,
+                            end_date: datetime) -> Iterator[tuple[datetime, List[Market], Set[str]]]:
+        """
+        Replay historical data along with the ids of markets whose prices moved.
+        
+        A market counts as changed on its first snapshot in the window and
+        whenever its YES or NO price differs from its previous snapshot.
+        
+        Yields:
+            (timestamp, markets, changed_ids)
+        """
         if not self._loaded:
             raise RuntimeError("No data loaded. Call load_csv() or load_from_directory() first.")
         
@@ -245,11 +367,21 @@ class HistoricalDataLoader:
                     timestamp_groups[snapshot.timestamp] = []
                 timestamp_groups[snapshot.timestamp].append(snapshot)
         
+        last_prices: Dict[str, tuple[Decimal, Decimal]] = {}
+        
         # Yield in chronological order
         for timestamp in sorted(timestamp_groups.keys()):
             snapshots = timestamp_groups[timestamp]
             markets = [s.to_market() for s in snapshots]
-            yield timestamp, markets
+            
+            changed_ids = set()
+            for snapshot in snapshots:
+                prices = (snapshot.yes_price, snapshot.no_price)
+                if last_prices.get(snapshot.market_id) != prices:
+                    last_prices[snapshot.market_id] = prices
+                    changed_ids.add(snapshot.market_id)
+            
+            yield timestamp, markets, changed_ids
     
     def get_market_at_time(self, market_id: str, timestamp: datetime) -> Optional[Market]:
         """
@@ -257,14 +389,28 @@ class HistoricalDataLoader:
         
         Used for filling orders at realistic prices.
         """
-        relevant_snapshots = [
-            s for s in self.snapshots
-            if s.market_id == market_id and s.timestamp <= timestamp
-        ]
+        times, snapshots = self._get_market_index().get(market_id, ([], []))
         
-        if not relevant_snapshots:
+        # Binary search for the last snapshot at or before timestamp
+        idx = bisect_right(times, timestamp) - 1
+        if idx < 0:
             return None
         
-        # Get most recent
-        latest = max(relevant_snapshots, key=lambda s: s.timestamp)
-        return latest.to_market()
+        return snapshots[idx].to_market()
+    
+    def _get_market_index(self) -> Dict[str, tuple[List[datetime], List[MarketSnapshot]]]:
+        """
+        Per-market time-sorted snapshots, built lazily.
+        
+        Rebuilt whenever the snapshot list is replaced or grows.
+        """
+        source = (id(self.snapshots), len(self.snapshots))
+        if self._market_index is None or self._market_index_source != source:
+            index: Dict[str, tuple[List[datetime], List[MarketSnapshot]]] = {}
+            for snapshot in sorted(self.snapshots, key=lambda s: s.timestamp):
+                times, snapshots = index.setdefault(snapshot.market_id, ([], []))
+                times.append(snapshot.timestamp)
+                snapshots.append(snapshot)
+            self._market_index = index
+            self._market_index_source = source
+        return self._market_index
@@ -5,20 +5,28 @@ Simulates the TradingEngine against historical data to validate strategies
 before live deployment. Replicates order execution, position tracking, and
 P&L without making real API calls.
 """
+import asyncio
+import itertools
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Set
 from decimal import Decimal
 
 from ..platforms.base import Market, OrderSide, Position, Order, OrderStatus, OrderType
-from ..strategies.base import TradingStrategy, Signal
+from ..strategies.base import TradingStrategy, Signal, MarketFeatures
 from ..risk.manager import RiskManager
 from .data import HistoricalDataLoader
+from .equity import EquityCurve
 
 logger = logging.getLogger(__name__)
 
 
+async def _gather_batches(coros: List) -> List:
+    """Await strategy coroutines together, returning exceptions as results."""
+    return await asyncio.gather(*coros, return_exceptions=True)
+
+
 @dataclass
 class BacktestConfig:
     """Configuration for backtesting."""
@@ -29,9 +37,16 @@ class BacktestConfig:
     commission_rate: Decimal = Decimal("0.01")  # 1% per trade
     slippage_bps: Decimal = Decimal("5")  # 5 basis points slippage
     platforms: List[str] = field(default_factory=lambda: ["kalshi"])
+    log_trades: bool = False  # Log every simulated fill at INFO level
+    
+    # Equity curve sampling: None records every tick; otherwise a point is
+    # kept on a relative move > equity_epsilon, after equity_min_interval,
+    # or on a new peak/trough
+    equity_epsilon: Optional[float] = None
+    equity_min_interval: timedelta = timedelta(minutes=1)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BacktestTrade:
     """Record of a simulated trade."""
     timestamp: datetime
@@ -46,7 +61,7 @@ class BacktestTrade:
     reason: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BacktestPosition:
     """Simulated position during backtest."""
     market_id: str
@@ -57,6 +72,7 @@ class BacktestPosition:
     entry_time: datetime
     strategy: str
     platform: str
+    position_id: int = 0  # Key in BacktestEngine.positions
 
 
 class BacktestEngine:
@@ -67,7 +83,8 @@ class BacktestEngine:
     instead of real-time market feeds.
     
     Key differences from live engine:
-    - No async (historical data is synchronous)
+    - Synchronous replay; strategy coroutines run on one persistent event
+      loop (_run_async/_run_fused) instead of a live scan loop
     - Simulated order fills with slippage
     - Commission modeling
     - Perfect record of all trades for analysis
@@ -83,11 +100,31 @@ class BacktestEngine:
         self.config = config
         self.risk = risk_manager
         
+        # Event loop for strategy coroutines, see _run_async()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Per-run dispatch plan, see _plan_strategies()
+        self._plan_strategies()
+        
+        # Per-fill logging; resolved against the logger level in run()
+        self._log_trades = config.log_trades
+        
+        # Fill cost constants, computed once instead of per fill
+        self._slippage_factor = config.slippage_bps / Decimal("10000")
+        self._commission_rate = config.commission_rate
+        
         # State
         self.balance = config.initial_balance
-        self.positions: List[BacktestPosition] = []
+        self.positions: Dict[int, BacktestPosition] = {}  # position_id -> position
+        self._position_ids = itertools.count(1)
         self.trades: List[BacktestTrade] = []
-        self.equity_curve: List[tuple[datetime, Decimal]] = []
+        self.equity_curve = EquityCurve(
+            epsilon=config.equity_epsilon,
+            min_interval=config.equity_min_interval
+        )
+        
+        # Reused across ticks so the id -> market index isn't reallocated
+        self._market_lookup: Dict[str, Market] = {}
         
         # Performance tracking
         self.wins = 0
@@ -113,12 +150,19 @@ class BacktestEngine:
         logger.info(f"Slippage: {self.config.slippage_bps} bps")
         logger.info("=" * 60)
         
+        self._log_trades = self.config.log_trades and logger.isEnabledFor(logging.INFO)
+        self._plan_strategies()
+        
         # Replay historical data
-        for timestamp, markets in self.data_loader.replay(
-            self.config.start_date,
-            self.config.end_date
-        ):
-            self._process_timestamp(timestamp, markets)
+        try:
+            for timestamp, markets, changed_ids in self.data_loader.replay_with_changes(
+                self.config.start_date,
+                self.config.end_date
+            ):
+                self._process_timestamp(timestamp, markets, changed_ids)
+        finally:
+            self._close_loop()
+        self.equity_curve.flush()
         
         # Close any remaining positions at final prices
         self._close_all_positions(timestamp)
@@ -127,18 +171,26 @@ class BacktestEngine:
         logger.info("BACKTEST COMPLETE")
         logger.info(f"Final Balance: ${self.balance:.2f}")
         logger.info(f"Total Return: {self._calculate_return():.2%}")
-        logger.info(f"Total Trades: {len(self.trades)}")
+        logger.info(f"Total Trades: {len(self.trades)} "
+                   f"({self.wins + self.losses} closed, {len(self.positions)} open)")
         logger.info(f"Win Rate: {self._calculate_win_rate():.2%}")
         logger.info(f"Max Drawdown: {self.max_drawdown:.2%}")
         logger.info("=" * 60)
         
         return self._generate_results()
     
-    def _process_timestamp(self, timestamp: datetime, markets: List[Market]) -> None:
+    def _process_timestamp(self, timestamp: datetime, markets: List[Market],
+                           changed_ids: Optional[Set[str]] = None) -> None:
         """Process a single point in time during backtest."""
+        # Index markets once per tick; shared by equity and exit checks
+        market_lookup = self._market_lookup
+        market_lookup.clear()
+        market_lookup.update((m.id, m) for m in markets)
+        features = MarketFeatures(markets)
+        
         # Update equity curve
-        equity = self._calculate_equity(markets)
-        self.equity_curve.append((timestamp, equity))
+        equity = self._calculate_equity(market_lookup)
+        self.equity_curve.record(timestamp, equity)
         
         # Track drawdown
         if equity > self.peak_equity:
@@ -149,68 +201,155 @@ class BacktestEngine:
                 self.max_drawdown = drawdown
         
         # Check exits on existing positions
-        self._check_exits(timestamp, markets)
+        self._check_exits(timestamp, market_lookup, features, changed_ids)
         
         # Scan for new entries if we have capacity
         if len(self.positions) < self.config.max_positions:
-            self._scan_entries(timestamp, markets)
+            self._scan_entries(timestamp, markets, features, changed_ids)
     
-    def _check_exits(self, timestamp: datetime, markets: List[Market]) -> None:
+    def _check_exits(self, timestamp: datetime, market_lookup: Dict[str, Market],
+                     features: MarketFeatures,
+                     changed_ids: Optional[Set[str]] = None) -> None:
         """Check all positions for exit signals."""
-        market_lookup = {m.id: m for m in markets}
-        positions_to_close = []
-        
-        for position in self.positions:
+        # Group positions by strategy so each strategy is asked once per tick
+        held_by_strategy: Dict[str, List[tuple]] = {}
+        for order, position in enumerate(self.positions.values()):
             market = market_lookup.get(position.market_id)
             if not market:
                 continue
-            
-            # Convert to Position object for strategy
-            pos_obj = self._to_position_object(position, market)
-            
-            # Check each strategy
-            strategy = self.strategies.get(position.strategy)
-            if not strategy:
+            if position.strategy not in self.strategies:
                 continue
             
-            # Async to sync adapter (strategies are async in live mode)
-            import asyncio
-            try:
-                exit_signal = asyncio.run(strategy.check_exit(pos_obj, market))
-            except:
-                # If async doesn't work, try calling directly
-                exit_signal = None
-            
-            if exit_signal:
-                positions_to_close.append((position, exit_signal, market))
+            # Incremental strategies skip markets whose price didn't move
+            if (changed_ids is not None and position.strategy in self._incremental_names
+                    and position.market_id not in changed_ids):
+                continue
+            held_by_strategy.setdefault(position.strategy, []).append(
+                (order, position, market)
+            )
+        
+        # Convert to Position objects and ask every strategy in one loop entry
+        calls = [
+            (strategy_name, self.strategies[strategy_name].check_exit_batch(
+                [(self._to_position_object(position, market), market)
+                 for _, position, market in held],
+                features
+            ))
+            for strategy_name, held in held_by_strategy.items()
+        ]
+        batches = self._run_fused(calls, "check_exit")
+        
+        positions_to_close = []
+        
+        for held, exit_signals in zip(held_by_strategy.values(), batches):
+            for (order, position, market), exit_signal in zip(held, exit_signals):
+                if exit_signal:
+                    positions_to_close.append((order, position, exit_signal, market))
         
-        # Execute exits
-        for position, signal, market in positions_to_close:
+        # Execute exits in position order
+        positions_to_close.sort(key=lambda item: item[0])
+        for _, position, signal, market in positions_to_close:
             self._execute_exit(timestamp, position, signal, market)
     
-    def _scan_entries(self, timestamp: datetime, markets: List[Market]) -> None:
+    def _run_async(self, coro):
+        """
+        Run a strategy coroutine to completion on the engine's event loop.
+        
+        The loop is created on first use and reused for the whole replay,
+        instead of paying asyncio.run()'s loop setup/teardown per call.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    def _run_fused(self, calls: List[tuple], label: str) -> List[List]:
+        """
+        Await several strategies' batch coroutines in a single loop entry.
+        
+        Args:
+            calls: (strategy_name, coroutine) pairs
+            label: Name of the strategy hook, used in warnings
+            
+        Returns:
+            Results in call order; strategies that failed with an expected
+            error yield an empty list
+        """
+        if not calls:
+            return []
+        
+        results = self._run_async(_gather_batches([coro for _, coro in calls]))
+        
+        batches = []
+        for (strategy_name, _), result in zip(calls, results):
+            if isinstance(result, (TypeError, RuntimeError)):
+                logger.warning("%s failed for %s: %s", label, strategy_name, result)
+                result = []
+            elif isinstance(result, BaseException):
+                raise result
+            batches.append(result)
+        return batches
+    
+    def _close_loop(self) -> None:
+        """Close the replay event loop, if one was created."""
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+    
+    def _plan_strategies(self) -> None:
+        """
+        Resolve per-strategy dispatch once per run instead of every tick.
+        
+        Builds the ordered (strategy, incremental) scan plan and the set
+        of incremental strategy names used by the exit check.
+        """
+        self._scan_plan = tuple(
+            (strategy, bool(strategy.incremental_scan))
+            for strategy in self.strategies.values()
+        )
+        self._incremental_names = frozenset(
+            strategy.name for strategy, incremental in self._scan_plan if incremental
+        )
+    
+    def _scan_entries(self, timestamp: datetime, markets: List[Market],
+                      features: MarketFeatures,
+                      changed_ids: Optional[Set[str]] = None) -> None:
         """Scan for entry opportunities."""
-        for strategy in self.strategies.values():
-            # Async to sync adapter
-            import asyncio
-            try:
-                signals = asyncio.run(strategy.scan_markets(markets))
-            except:
-                signals = []
+        changed = None
+        incremental_active = changed_ids is not None
+        risk = self.risk
+        
+        calls = []
+        for strategy, incremental in self._scan_plan:
+            scan_markets, scan_features = markets, features
+            
+            # Incremental strategies only see markets whose price moved
+            if incremental and incremental_active:
+                if changed is None:
+                    changed_markets = [m for m in markets if m.id in changed_ids]
+                    changed = (changed_markets, MarketFeatures(changed_markets))
+                scan_markets, scan_features = changed
+                if not scan_markets:
+                    continue
             
+            calls.append((strategy, strategy.scan_batch(scan_markets, scan_features)))
+        
+        # Every strategy scans in one event-loop entry; signals are then
+        # executed strategy by strategy in plan order
+        batches = self._run_fused([(s.name, coro) for s, coro in calls], "scan_markets")
+        for (strategy, _), signals in zip(calls, batches):
             for signal in signals:
                 # Risk check
-                if self.risk:
-                    allowed, reason = self.risk.check_trade_allowed()
+                if risk:
+                    allowed, reason = risk.check_trade_allowed()
                     if not allowed:
-                        logger.debug(f"Signal rejected by risk: {reason}")
+                        logger.debug("Signal rejected by risk: %s", reason)
                         continue
                 
                 # Calculate position size
                 size = strategy.get_position_size(signal, self.balance)
                 
                 # Size validation
-                if self.risk and not self.risk.validate_position_size(
+                if risk and not risk.validate_position_size(
                     size, signal.target_price or Decimal("0.5")
                 ):
                     continue
@@ -228,17 +367,17 @@ class BacktestEngine:
             # Market order - use current price plus slippage
             base_price = (signal.market.yes_price if signal.side == OrderSide.YES 
                          else signal.market.no_price)
-            slippage = base_price * (self.config.slippage_bps / Decimal("10000"))
+            slippage = base_price * self._slippage_factor
             fill_price = base_price + slippage
         
         # Calculate costs
         trade_value = fill_price * size
-        commission = trade_value * self.config.commission_rate
+        commission = trade_value * self._commission_rate
         total_cost = trade_value + commission
         
         # Check if we can afford it
         if total_cost > self.balance:
-            logger.debug(f"Insufficient balance for trade: {total_cost} > {self.balance}")
+            logger.debug("Insufficient balance for trade: %s > %s", total_cost, self.balance)
             return
         
         # Deduct from balance
@@ -254,9 +393,10 @@ class BacktestEngine:
             entry_price=fill_price,
             entry_time=timestamp,
             strategy=strategy_name,
-            platform=signal.market.platform
+            platform=signal.market.platform,
+            position_id=next(self._position_ids)
         )
-        self.positions.append(position)
+        self.positions[position.position_id] = position
         
         # Record trade
         trade = BacktestTrade(
@@ -273,8 +413,10 @@ class BacktestEngine:
         )
         self.trades.append(trade)
         
-        logger.info(f"[{timestamp}] ENTRY: {signal.market.ticker} {signal.side.value.upper()} "
-                   f"x{size} @ ${fill_price:.3f} | {signal.reason}")
+        if self._log_trades:
+            logger.info("[%s] ENTRY: %s %s x%d @ $%.3f | %s",
+                        timestamp, signal.market.ticker, signal.side.value.upper(),
+                        size, fill_price, signal.reason)
     
     def _execute_exit(self, timestamp: datetime, position: BacktestPosition,
                       signal: Signal, market: Market) -> None:
@@ -284,12 +426,12 @@ class BacktestEngine:
                      else market.no_price)
         
         # Add slippage
-        slippage = exit_price * (self.config.slippage_bps / Decimal("10000"))
+        slippage = exit_price * self._slippage_factor
         fill_price = exit_price - slippage  # Negative for exits
         
         # Calculate P&L
         trade_value = fill_price * position.quantity
-        commission = trade_value * self.config.commission_rate
+        commission = trade_value * self._commission_rate
         gross_pnl = trade_value - (position.entry_price * position.quantity)
         net_pnl = gross_pnl - commission - self.total_commission
         
@@ -304,7 +446,7 @@ class BacktestEngine:
             self.losses += 1
         
         # Remove position
-        self.positions.remove(position)
+        del self.positions[position.position_id]
         
         # Record trade
         trade = BacktestTrade(
@@ -321,8 +463,9 @@ class BacktestEngine:
         )
         self.trades.append(trade)
         
-        logger.info(f"[{timestamp}] EXIT: {position.ticker} "
-                   f"@ ${fill_price:.3f} | P&L: ${net_pnl:+.2f} | {signal.reason}")
+        if self._log_trades:
+            logger.info("[%s] EXIT: %s @ $%.3f | P&L: $%+.2f | %s",
+                        timestamp, position.ticker, fill_price, net_pnl, signal.reason)
     
     def _close_all_positions(self, final_timestamp: datetime) -> None:
         """Force close all remaining positions at end of backtest."""
@@ -331,7 +474,7 @@ class BacktestEngine:
         
         logger.info(f"Closing {len(self.positions)} remaining positions...")
         
-        for position in self.positions[:]:  # Copy list since we'll modify it
+        for position in list(self.positions.values()):  # Copy since we'll modify it
             # Get final market price
             market = self.data_loader.get_market_at_time(position.market_id, final_timestamp)
             if not market:
@@ -349,13 +492,11 @@ class BacktestEngine:
             
             self._execute_exit(final_timestamp, position, exit_signal, market)
     
-    def _calculate_equity(self, markets: List[Market]) -> Decimal:
+    def _calculate_equity(self, market_lookup: Dict[str, Market]) -> Decimal:
         """Calculate current equity (balance + unrealized P&L)."""
         equity = self.balance
         
-        market_lookup = {m.id: m for m in markets}
-        
-        for position in self.positions:
+        for position in self.positions.values():
             market = market_lookup.get(position.market_id)
             if market:
                 # Current value of position
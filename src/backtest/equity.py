@@ -0,0 +1,109 @@
+"""
+Equity Curve Storage for Backtesting
+
+Columnar (structure-of-arrays) storage for the equity curve recorded on
+every replay tick, so metrics can run over a contiguous float64 buffer
+instead of a list of boxed (timestamp, Decimal) tuples.
+"""
+import math
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+class EquityCurve:
+    """
+    Growable equity curve backed by a preallocated float64 array.
+    
+    Values grow by doubling; timestamps are kept in a parallel list so
+    timezone information on the replayed datetimes is preserved.
+    Iterating or indexing yields (timestamp, equity) tuples, so existing
+    code written against a list of tuples keeps working.
+    
+    With ``epsilon`` set, record() keeps a point only if equity moved by
+    more than ``epsilon`` relative to the last kept point, at least
+    ``min_interval`` has passed, or it is a new peak or a new low since
+    the last peak. The last rule keeps max drawdown and its duration
+    exact.
+    """
+    
+    def __init__(self, capacity: int = 1024,
+                 epsilon: Optional[float] = None,
+                 min_interval: Optional[timedelta] = None):
+        self._timestamps: List[datetime] = []
+        self._values = np.empty(max(capacity, 1), dtype=np.float64)
+        self._size = 0
+        
+        # Sampling
+        self.epsilon = epsilon
+        self.min_interval = min_interval
+        self._peak = -math.inf
+        self._trough = math.inf
+        self._pending: Optional[Tuple[datetime, float]] = None
+    
+    def append(self, timestamp: datetime, equity: Union[Decimal, float]) -> None:
+        """Record equity at a point in time."""
+        value = float(equity)
+        if self._size == self._values.size:
+            self._grow()
+        self._values[self._size] = value
+        self._timestamps.append(timestamp)
+        self._size += 1
+        self._pending = None
+        
+        if value > self._peak:
+            self._peak = value
+            self._trough = value
+        elif value < self._trough:
+            self._trough = value
+    
+    def record(self, timestamp: datetime, equity: Union[Decimal, float]) -> None:
+        """Record equity, subject to sampling when epsilon is set."""
+        if self.epsilon is None or not self._size:
+            self.append(timestamp, equity)
+            return
+        
+        value = float(equity)
+        last = self._values[self._size - 1]
+        
+        if (value > self._peak or value < self._trough
+                or abs(value - last) > self.epsilon * abs(last)
+                or (self.min_interval is not None
+                    and timestamp - self._timestamps[-1] >= self.min_interval)):
+            self.append(timestamp, value)
+        else:
+            self._pending = (timestamp, value)
+    
+    def flush(self) -> None:
+        """Keep the most recent skipped point so the curve ends on the final equity."""
+        if self._pending is not None:
+            self.append(*self._pending)
+    
+    def _grow(self) -> None:
+        """Double the capacity of the value buffer."""
+        values = np.empty(self._values.size * 2, dtype=np.float64)
+        values[:self._size] = self._values[:self._size]
+        self._values = values
+    
+    @property
+    def timestamps(self) -> List[datetime]:
+        """Recorded timestamps in time order."""
+        return self._timestamps
+    
+    @property
+    def values(self) -> np.ndarray:
+        """Recorded equity values as a float64 view (no copy)."""
+        return self._values[:self._size]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator[Tuple[datetime, float]]:
+        return zip(self._timestamps, self.values.tolist())
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(self._timestamps[index], self.values[index].tolist()))
+        return self._timestamps[index], float(self.values[index])
@@ -5,12 +5,18 @@ Calculates industry-standard trading metrics including Sharpe ratio,
 maximum drawdown, win rate, and risk-adjusted returns.
 """
 import logging
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from typing import List, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 import math
 
+import numpy as np
+
+from ._numba_kernels import HAS_NUMBA, max_drawdown_kernel
+from .equity import EquityCurve
+
 logger = logging.getLogger(__name__)
 
 
@@ -126,45 +132,34 @@ def calculate_metrics(results: dict) -> PerformanceMetrics:
     # Maximum drawdown
     max_dd, max_dd_duration = _calculate_max_drawdown(equity_curve)
     
-    # Trade statistics
-    entry_trades = [t for t in trades if t.trade_type == 'entry']
-    exit_trades = [t for t in trades if t.trade_type == 'exit']
+    # Trade statistics (single pass over the trade log)
+    trade_summary = _summarize_trades(trades)
     
-    total_trades = len(exit_trades)  # Count completed round trips
+    total_trades = trade_summary.exits  # Count completed round trips
     wins = results['wins']
     losses = results['losses']
     win_rate = Decimal(wins) / Decimal(total_trades) if total_trades > 0 else Decimal("0")
     
     # Profit/loss analysis
-    winning_trades = []
-    losing_trades = []
+    winning_count = trade_summary.winning_count
+    losing_count = trade_summary.losing_count
+    gross_profit = trade_summary.gross_profit
     
-    for exit_trade in exit_trades:
-        # Find matching entry
-        entry = _find_entry_trade(entry_trades, exit_trade)
-        if not entry:
-            continue
-        
-        pnl = _calculate_trade_pnl(entry, exit_trade)
-        
-        if pnl > 0:
-            winning_trades.append(pnl)
-        else:
-            losing_trades.append(pnl)
-    
-    avg_win = sum(winning_trades) / len(winning_trades) if winning_trades else Decimal("0")
-    avg_loss = sum(losing_trades) / len(losing_trades) if losing_trades else Decimal("0")
+    avg_win = gross_profit / winning_count if winning_count else Decimal("0")
+    avg_loss = trade_summary.gross_loss / losing_count if losing_count else Decimal("0")
     
     # Profit factor
-    gross_profit = sum(winning_trades) if winning_trades else Decimal("0")
-    gross_loss = abs(sum(losing_trades)) if losing_trades else Decimal("1")  # Avoid div by zero
+    gross_loss = abs(trade_summary.gross_loss) if losing_count else Decimal("1")  # Avoid div by zero
     profit_factor = gross_profit / gross_loss if gross_loss > 0 else Decimal("0")
     
     # Position duration
-    avg_duration = _calculate_avg_trade_duration(entry_trades, exit_trades)
+    if trade_summary.paired:
+        avg_duration = timedelta(seconds=trade_summary.duration_seconds / trade_summary.paired)
+    else:
+        avg_duration = timedelta(0)
     
     # Max concurrent positions
-    max_concurrent = _calculate_max_concurrent_positions(entry_trades, exit_trades)
+    max_concurrent = trade_summary.max_concurrent
     
     # Commission analysis
     total_commission = results['total_commission']
@@ -194,40 +189,42 @@ def calculate_metrics(results: dict) -> PerformanceMetrics:
     )
 
 
-def _calculate_returns_series(equity_curve: List[Tuple[datetime, Decimal]]) -> List[Decimal]:
+def _equity_values(equity_curve: List[Tuple[datetime, Decimal]]) -> np.ndarray:
+    """Extract equity values from the curve as a float64 array."""
+    if isinstance(equity_curve, EquityCurve):
+        return equity_curve.values
+    return np.fromiter(
+        (float(equity) for _, equity in equity_curve),
+        dtype=np.float64,
+        count=len(equity_curve)
+    )
+
+
+def _calculate_returns_series(equity_curve: List[Tuple[datetime, Decimal]]) -> np.ndarray:
     """Calculate period-over-period returns from equity curve."""
     if len(equity_curve) < 2:
-        return []
+        return np.empty(0, dtype=np.float64)
     
-    returns = []
-    for i in range(1, len(equity_curve)):
-        prev_equity = equity_curve[i-1][1]
-        curr_equity = equity_curve[i][1]
-        
-        if prev_equity > 0:
-            period_return = (curr_equity - prev_equity) / prev_equity
-            returns.append(period_return)
+    equity = _equity_values(equity_curve)
+    prev_equity = equity[:-1]
+    curr_equity = equity[1:]
     
-    return returns
+    # Skip periods starting from non-positive equity
+    valid = prev_equity > 0
+    return (curr_equity[valid] - prev_equity[valid]) / prev_equity[valid]
 
 
-def _calculate_sharpe_ratio(returns: List[Decimal], risk_free_rate: Decimal = Decimal("0.02")) -> Decimal:
+def _calculate_sharpe_ratio(returns: np.ndarray, risk_free_rate: Decimal = Decimal("0.02")) -> Decimal:
     """
     Calculate annualized Sharpe ratio.
     
     Sharpe = (Mean Return - Risk Free Rate) / Std Dev of Returns
     """
-    if not returns:
+    if returns.size == 0:
         return Decimal("0")
     
-    # Convert to float for math operations
-    returns_float = [float(r) for r in returns]
-    
-    mean_return = sum(returns_float) / len(returns_float)
-    
-    # Standard deviation
-    variance = sum((r - mean_return) ** 2 for r in returns_float) / len(returns_float)
-    std_dev = math.sqrt(variance)
+    mean_return = float(returns.mean())
+    std_dev = float(returns.std())
     
     if std_dev == 0:
         return Decimal("0")
@@ -241,26 +238,24 @@ def _calculate_sharpe_ratio(returns: List[Decimal], risk_free_rate: Decimal = De
     return Decimal(str(sharpe))
 
 
-def _calculate_sortino_ratio(returns: List[Decimal], risk_free_rate: Decimal = Decimal("0.02")) -> Decimal:
+def _calculate_sortino_ratio(returns: np.ndarray, risk_free_rate: Decimal = Decimal("0.02")) -> Decimal:
     """
     Calculate Sortino ratio (uses downside deviation instead of total volatility).
     
     Better metric than Sharpe for asymmetric return distributions.
     """
-    if not returns:
+    if returns.size == 0:
         return Decimal("0")
     
-    returns_float = [float(r) for r in returns]
-    mean_return = sum(returns_float) / len(returns_float)
+    mean_return = float(returns.mean())
     
     # Downside deviation (only negative returns)
-    downside_returns = [r for r in returns_float if r < 0]
+    downside_returns = returns[returns < 0]
     
-    if not downside_returns:
+    if downside_returns.size == 0:
         return Decimal("999")  # No downside = infinite Sortino
     
-    downside_variance = sum(r ** 2 for r in downside_returns) / len(downside_returns)
-    downside_std = math.sqrt(downside_variance)
+    downside_std = math.sqrt(float(np.square(downside_returns).mean()))
     
     if downside_std == 0:
         return Decimal("0")
@@ -284,32 +279,81 @@ def _calculate_max_drawdown(equity_curve: List[Tuple[datetime, Decimal]]) -> Tup
     if not equity_curve:
         return Decimal("0"), timedelta(0)
     
-    max_dd = Decimal("0")
-    max_dd_duration = timedelta(0)
+    equity = _equity_values(equity_curve)
     
-    peak = equity_curve[0][1]
-    peak_date = equity_curve[0][0]
+    if HAS_NUMBA:
+        max_dd, peak, trough = max_drawdown_kernel(equity)
+    else:
+        peaks = np.maximum.accumulate(equity)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = (peaks - equity) / peaks
+        
+        # argmax returns the first occurrence, matching a strict ">" scan
+        trough = int(drawdowns.argmax())
+        max_dd = float(drawdowns[trough])
+        peak = int(equity[:trough + 1].argmax())
     
-    for timestamp, equity in equity_curve:
-        if equity > peak:
-            peak = equity
-            peak_date = timestamp
-        else:
-            dd = (peak - equity) / peak
-            if dd > max_dd:
-                max_dd = dd
-                max_dd_duration = timestamp - peak_date
+    if not max_dd > 0:
+        return Decimal("0"), timedelta(0)
+    
+    max_dd_duration = equity_curve[trough][0] - equity_curve[peak][0]
     
-    return max_dd, max_dd_duration
+    return Decimal(str(max_dd)), max_dd_duration
 
 
-def _find_entry_trade(entry_trades, exit_trade):
-    """Find the entry trade matching an exit."""
-    for entry in entry_trades:
-        if (entry.market_id == exit_trade.market_id and 
-            entry.timestamp < exit_trade.timestamp):
-            return entry
-    return None
+@dataclass
+class _TradeSummary:
+    """Aggregates collected in one pass over the trade log."""
+    exits: int = 0
+    paired: int = 0
+    winning_count: int = 0
+    losing_count: int = 0
+    gross_profit: Decimal = Decimal("0")
+    gross_loss: Decimal = Decimal("0")  # Sum of non-positive P&Ls
+    duration_seconds: float = 0.0
+    max_concurrent: int = 0
+
+
+def _summarize_trades(trades) -> _TradeSummary:
+    """
+    Compute round-trip P&L, holding time and concurrency in one pass.
+    
+    Exits are paired FIFO per market with the oldest open entry that
+    happened strictly before them.
+    """
+    summary = _TradeSummary()
+    open_entries = defaultdict(deque)
+    concurrent = 0
+    
+    for trade in sorted(trades, key=lambda t: t.timestamp):
+        if trade.trade_type == 'entry':
+            open_entries[trade.market_id].append(trade)
+            concurrent += 1
+            if concurrent > summary.max_concurrent:
+                summary.max_concurrent = concurrent
+            continue
+        
+        summary.exits += 1
+        concurrent -= 1
+        
+        queue = open_entries.get(trade.market_id)
+        if not queue or queue[0].timestamp >= trade.timestamp:
+            continue
+        entry = queue.popleft()
+        
+        pnl = _calculate_trade_pnl(entry, trade)
+        if pnl > 0:
+            summary.winning_count += 1
+            summary.gross_profit += pnl
+        else:
+            summary.losing_count += 1
+            summary.gross_loss += pnl
+        
+        summary.paired += 1
+        summary.duration_seconds += (trade.timestamp - entry.timestamp).total_seconds()
+    
+    return summary
 
 
 def _calculate_trade_pnl(entry_trade, exit_trade) -> Decimal:
@@ -317,44 +361,3 @@ def _calculate_trade_pnl(entry_trade, exit_trade) -> Decimal:
     entry_cost = entry_trade.price * entry_trade.quantity + entry_trade.commission
     exit_value = exit_trade.price * exit_trade.quantity - exit_trade.commission
     return exit_value - entry_cost
-
-
-def _calculate_avg_trade_duration(entry_trades, exit_trades) -> timedelta:
-    """Calculate average holding period."""
-    durations = []
-    
-    for exit_trade in exit_trades:
-        entry = _find_entry_trade(entry_trades, exit_trade)
-        if entry:
-            duration = exit_trade.timestamp - entry.timestamp
-            durations.append(duration)
-    
-    if not durations:
-        return timedelta(0)
-    
-    total_seconds = sum(d.total_seconds() for d in durations)
-    avg_seconds = total_seconds / len(durations)
-    
-    return timedelta(seconds=avg_seconds)
-
-
-def _calculate_max_concurrent_positions(entry_trades, exit_trades) -> int:
-    """Calculate maximum number of positions held at once."""
-    events = []
-    
-    for entry in entry_trades:
-        events.append((entry.timestamp, 1, entry.market_id))  # +1 position
-    
-    for exit in exit_trades:
-        events.append((exit.timestamp, -1, exit.market_id))  # -1 position
-    
-    events.sort(key=lambda x: x[0])
-    
-    current_positions = 0
-    max_positions = 0
-    
-    for timestamp, delta, market_id in events:
-        current_positions += delta
-        max_positions = max(max_positions, current_positions)
-    
-    return max_positions
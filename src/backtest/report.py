@@ -7,18 +7,35 @@ Generates comprehensive reports from backtesting results including:
 - Equity curve visualization (text-based)
 - Strategy breakdown
 """
+import io
 import logging
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+import sys
+from collections import defaultdict, deque
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import BinaryIO, Callable, List, Dict, Optional
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 import json
 
+import numpy as np
+
+from .equity import EquityCurve
 from .metrics import PerformanceMetrics, calculate_metrics
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Trades / equity points encoded per write when streaming JSON
+JSON_CHUNK_SIZE = 4096
+
 
 @dataclass
 class BacktestReport:
@@ -26,92 +43,98 @@ class BacktestReport:
     metrics: PerformanceMetrics
     results: Dict
     timestamp: datetime
+    exact_accounting: bool = False  # Decimal P&L in stats instead of float64
     
     def to_text(self) -> str:
         """Generate text report."""
-        lines = []
-        lines.append("=" * 70)
-        lines.append("PR3DICT BACKTEST REPORT")
-        lines.append(f"Generated: {self.timestamp}")
-        lines.append("=" * 70)
-        lines.append("")
+        rule = "=" * 70
+        divider = "-" * 70
+        buf = io.StringIO()
+        w = buf.write
+        
+        w(f"{rule}\nPR3DICT BACKTEST REPORT\nGenerated: {self.timestamp}\n{rule}\n\n")
         
         # Performance metrics
-        lines.append(str(self.metrics))
-        lines.append("")
+        w(f"{self.metrics}\n\n")
         
         # Strategy breakdown
-        lines.append("Strategy Performance:")
-        lines.append("-" * 70)
+        w(f"Strategy Performance:\n{divider}\n")
         strategy_stats = self._calculate_strategy_stats()
-        for strategy, stats in strategy_stats.items():
-            lines.append(f"\n{strategy}:")
-            lines.append(f"  Trades: {stats['trades']}")
-            lines.append(f"  Win Rate: {stats['win_rate']:.2%}")
-            lines.append(f"  Avg P&L: ${stats['avg_pnl']:.2f}")
-        lines.append("")
+        buf.writelines(
+            f"\n{strategy}:\n"
+            f"  Trades: {stats['trades']}\n"
+            f"  Win Rate: {stats['win_rate']:.2%}\n"
+            f"  Avg P&L: ${stats['avg_pnl']:.2f}\n"
+            for strategy, stats in strategy_stats.items()
+        )
+        w("\n")
         
         # Recent trades
-        lines.append("Recent Trades (last 10):")
-        lines.append("-" * 70)
-        trades = self.results['trades'][-10:]
-        for trade in trades:
-            lines.append(
-                f"{trade.timestamp} | {trade.ticker:12} | "
-                f"{trade.side.value.upper():4} | {trade.trade_type:5} | "
-                f"${trade.price:.3f} x{trade.quantity:3} | {trade.reason}"
-            )
-        lines.append("")
+        w(f"Recent Trades (last 10):\n{divider}\n")
+        buf.writelines(
+            f"{trade.timestamp} | {trade.ticker:12} | "
+            f"{trade.side.value.upper():4} | {trade.trade_type:5} | "
+            f"${trade.price:.3f} x{trade.quantity:3} | {trade.reason}\n"
+            for trade in self.results['trades'][-10:]
+        )
+        w("\n")
         
         # Equity curve (text-based sparkline)
-        lines.append("Equity Curve:")
-        lines.append("-" * 70)
-        lines.append(self._generate_equity_sparkline())
-        lines.append("")
+        w(f"Equity Curve:\n{divider}\n")
+        w(f"{self._generate_equity_sparkline()}\n\n")
         
-        lines.append("=" * 70)
+        w(rule)
         
-        return "\n".join(lines)
+        return buf.getvalue()
     
     def to_json(self) -> str:
         """Generate JSON report."""
-        data = {
-            'timestamp': self.timestamp.isoformat(),
+        buffer = io.BytesIO()
+        self.write_json(buffer)
+        return buffer.getvalue().decode('utf-8')
+    
+    def write_json(self, fp: BinaryIO) -> None:
+        """
+        Stream the JSON report to a binary file handle.
+        
+        Trades and equity points are encoded in chunks so the whole
+        document never exists as one Python object.
+        """
+        metrics = self.metrics
+        header = {
+            'timestamp': self.timestamp,
             'metrics': {
-                'total_return': str(self.metrics.total_return),
-                'annualized_return': str(self.metrics.annualized_return),
-                'sharpe_ratio': str(self.metrics.sharpe_ratio),
-                'sortino_ratio': str(self.metrics.sortino_ratio),
-                'max_drawdown': str(self.metrics.max_drawdown),
-                'win_rate': str(self.metrics.win_rate),
-                'total_trades': self.metrics.total_trades,
-                'profit_factor': str(self.metrics.profit_factor),
+                'total_return': _fixed(metrics.total_return),
+                'annualized_return': _fixed(metrics.annualized_return),
+                'sharpe_ratio': _fixed(metrics.sharpe_ratio),
+                'sortino_ratio': _fixed(metrics.sortino_ratio),
+                'max_drawdown': _fixed(metrics.max_drawdown),
+                'win_rate': _fixed(metrics.win_rate),
+                'total_trades': metrics.total_trades,
+                'profit_factor': _fixed(metrics.profit_factor),
             },
-            'trades': [
-                {
-                    'timestamp': t.timestamp.isoformat(),
-                    'market_id': t.market_id,
-                    'ticker': t.ticker,
-                    'side': t.side.value,
-                    'quantity': t.quantity,
-                    'price': str(t.price),
-                    'commission': str(t.commission),
-                    'trade_type': t.trade_type,
-                    'strategy': t.strategy,
-                    'reason': t.reason
-                }
-                for t in self.results['trades']
-            ],
-            'equity_curve': [
-                {
-                    'timestamp': ts.isoformat(),
-                    'equity': str(eq)
-                }
-                for ts, eq in self.results['equity_curve']
-            ]
         }
+        fp.write(_dumps(header)[:-1])
+        
+        trades = self.results['trades']
+        fp.write(b',"trades":[')
+        _write_chunks(fp, len(trades), lambda start, stop: trades[start:stop])
         
-        return json.dumps(data, indent=2)
+        # EquityCurve columns are sliced directly instead of via row tuples
+        equity_curve = self.results['equity_curve']
+        if isinstance(equity_curve, EquityCurve):
+            timestamps, values = equity_curve.timestamps, equity_curve.values
+            encode_equity = lambda start, stop: [
+                {'timestamp': ts, 'equity': _fixed(eq)}
+                for ts, eq in zip(timestamps[start:stop], values[start:stop].tolist())
+            ]
+        else:
+            encode_equity = lambda start, stop: [
+                {'timestamp': ts, 'equity': _fixed(eq)} for ts, eq in equity_curve[start:stop]
+            ]
+        fp.write(b'],"equity_curve":[')
+        _write_chunks(fp, len(equity_curve), encode_equity)
+        fp.write(b']}')
     
     def save(self, output_dir: Path, format: str = 'text') -> Path:
         """Save report to file."""
@@ -121,12 +144,11 @@ class BacktestReport:
         filepath = output_dir / filename
         
         if format == 'json':
-            content = self.to_json()
+            with open(filepath, 'wb') as f:
+                self.write_json(f)
         else:
-            content = self.to_text()
-        
-        with open(filepath, 'w') as f:
-            f.write(content)
+            with open(filepath, 'w') as f:
+                f.write(self.to_text())
         
         logger.info(f"Report saved to {filepath}")
         return filepath
@@ -135,43 +157,74 @@ class BacktestReport:
         """Calculate per-strategy statistics."""
         trades = self.results['trades']
         
-        strategy_trades = {}
-        for trade in trades:
-            if trade.strategy not in strategy_trades:
-                strategy_trades[trade.strategy] = []
-            strategy_trades[trade.strategy].append(trade)
+        exact = self.exact_accounting
         
-        stats = {}
-        for strategy, strat_trades in strategy_trades.items():
-            exits = [t for t in strat_trades if t.trade_type == 'exit']
-            entries = [t for t in strat_trades if t.trade_type == 'entry']
-            
-            if not exits:
+        # One pass over the log: queue entries per (strategy, market) and
+        # pair each exit FIFO with the oldest earlier entry in its market
+        open_entries: Dict[tuple, deque] = defaultdict(deque)
+        strategy_codes: Dict[str, int] = {}
+        exit_counts: List[int] = []
+        pnl_sums: List[Decimal] = []
+        paired: List[int] = []
+        wins: List[int] = []
+        paired_entries = []
+        paired_exits = []
+        codes = []
+        for trade in trades:
+            if trade.trade_type == 'entry':
+                open_entries[(trade.strategy, trade.market_id)].append(trade)
+                continue
+            if trade.trade_type != 'exit':
                 continue
             
-            # Calculate P&L for each trade
-            pnls = []
-            wins = 0
-            
-            for exit_trade in exits:
-                # Find matching entry
-                entry = None
-                for e in entries:
-                    if (e.market_id == exit_trade.market_id and 
-                        e.timestamp < exit_trade.timestamp):
-                        entry = e
-                        break
-                
-                if entry:
-                    pnl = self._calculate_pnl(entry, exit_trade)
-                    pnls.append(pnl)
-                    if pnl > 0:
-                        wins += 1
+            code = strategy_codes.get(trade.strategy)
+            if code is None:
+                code = strategy_codes[trade.strategy] = len(exit_counts)
+                exit_counts.append(0)
+                pnl_sums.append(Decimal("0"))
+                paired.append(0)
+                wins.append(0)
+            exit_counts[code] += 1
             
+            queue = open_entries.get((trade.strategy, trade.market_id))
+            if not queue or queue[0].timestamp >= trade.timestamp:
+                continue
+            entry = queue.popleft()
+            if exact:
+                pnl = self._calculate_pnl(entry, trade)
+                pnl_sums[code] += pnl
+                paired[code] += 1
+                wins[code] += pnl > 0
+            else:
+                paired_entries.append(entry)
+                paired_exits.append(trade)
+                codes.append(code)
+        
+        names = list(strategy_codes)
+        if exact:
+            avg_pnls = [
+                pnl_sum / count if count else Decimal("0")
+                for pnl_sum, count in zip(pnl_sums, paired)
+            ]
+        else:
+            # Vectorized float64 P&L, aggregated per strategy code
+            code_array = np.asarray(codes, dtype=np.intp)
+            pnls = _batch_pnl(paired_entries, paired_exits)
+            pnl_sums = np.bincount(code_array, weights=pnls, minlength=len(names))
+            paired = np.bincount(code_array, minlength=len(names)).tolist()
+            wins = np.bincount(code_array, weights=pnls > 0, minlength=len(names)).astype(int).tolist()
+            avg_pnls = [
+                Decimal(str(pnl_sum / count)) if count else Decimal("0")
+                for pnl_sum, count in zip(pnl_sums.tolist(), paired)
+            ]
+        
+        stats = {}
+        for code, strategy in enumerate(names):
+            exit_count = exit_counts[code]
             stats[strategy] = {
-                'trades': len(exits),
-                'win_rate': Decimal(wins) / Decimal(len(exits)) if exits else Decimal("0"),
-                'avg_pnl': sum(pnls) / len(pnls) if pnls else Decimal("0")
+                'trades': exit_count,
+                'win_rate': Decimal(wins[code]) / Decimal(exit_count),
+                'avg_pnl': avg_pnls[code]
             }
         
         return stats
@@ -189,55 +242,111 @@ class BacktestReport:
         if not equity_curve:
             return "No data"
         
-        # Sample points if too many
+        # Sample by index only: a strided view of EquityCurve buffers, or
+        # just the sampled points of a plain list, never a full copy
         max_points = 60
-        if len(equity_curve) > max_points:
-            step = len(equity_curve) // max_points
-            sampled = equity_curve[::step]
+        step = len(equity_curve) // max_points if len(equity_curve) > max_points else 1
+        indices = range(0, len(equity_curve), step)
+        if isinstance(equity_curve, EquityCurve):
+            values = equity_curve.values[::step]
         else:
-            sampled = equity_curve
-        
-        values = [float(eq) for _, eq in sampled]
-        
-        if not values:
-            return "No data"
-        
-        # Normalize to 0-10 range
-        min_val = min(values)
-        max_val = max(values)
+            values = np.fromiter(
+                (float(equity_curve[i][1]) for i in indices),
+                dtype=np.float64,
+                count=len(indices)
+            )
         
+        # Normalize to 0-10 and clamp to glyph indices 0-8
+        min_val, max_val = values.min(), values.max()
         if max_val == min_val:
-            normalized = [5] * len(values)
+            glyphs = np.full(len(values), 5)
         else:
-            normalized = [
-                int(((v - min_val) / (max_val - min_val)) * 10)
-                for v in values
-            ]
+            glyphs = np.digitize(values, min_val + (max_val - min_val) * np.arange(1, 9) / 10)
+        first_ts = equity_curve[indices[0]][0]
+        last_ts = equity_curve[indices[-1]][0]
         
         # Create sparkline
         chars = " ▁▂▃▄▅▆▇█"
-        sparkline = "".join(chars[min(n, 8)] for n in normalized)
+        sparkline = "".join([chars[n] for n in glyphs.tolist()])
         
         # Add labels
-        lines = []
-        lines.append(f"${max_val:,.0f} ┤")
-        lines.append(f"        │ {sparkline}")
-        lines.append(f"${min_val:,.0f} ┤")
-        lines.append(f"        └{'─' * len(sparkline)}")
-        lines.append(f"        {sampled[0][0].strftime('%m/%d')}" + 
-                    " " * (len(sparkline) - 10) + 
-                    f"{sampled[-1][0].strftime('%m/%d')}")
-        
-        return "\n".join(lines)
+        padding = " " * (len(sparkline) - 10)
+        return (
+            f"${max_val:,.0f} ┤\n"
+            f"        │ {sparkline}\n"
+            f"${min_val:,.0f} ┤\n"
+            f"        └{'─' * len(sparkline)}\n"
+            f"        {first_ts.strftime('%m/%d')}{padding}{last_ts.strftime('%m/%d')}"
+        )
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> tuple:
+    """Dataclass field names, resolved once per class."""
+    return tuple(f.name for f in fields(cls))
+
+
+def _fixed(value) -> str:
+    """Format a monetary or ratio value to 6 decimal places, dropping float noise."""
+    return f"{value:.6f}"
+
+
+def _json_default(obj):
+    """Encode report values the JSON encoders don't handle natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if is_dataclass(obj):
+        return {name: getattr(obj, name) for name in _field_names(type(obj))}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj) -> bytes:
+    """Encode an object as UTF-8 JSON, with orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+
+def _write_chunks(fp: BinaryIO, count: int, encode_range: Callable[[int, int], list]) -> None:
+    """Write count elements as comma-separated JSON array items, one chunk at a time."""
+    first = True
+    for start in range(0, count, JSON_CHUNK_SIZE):
+        chunk = _dumps(encode_range(start, start + JSON_CHUNK_SIZE))
+        if len(chunk) <= 2:
+            continue
+        if not first:
+            fp.write(b',')
+        fp.write(chunk[1:-1])
+        first = False
+
+
+def _batch_pnl(entries: List, exits: List) -> np.ndarray:
+    """Round-trip P&L for paired trades as a float64 vector."""
+    def column(trades, attr):
+        return np.fromiter((float(getattr(t, attr)) for t in trades),
+                           dtype=np.float64, count=len(trades))
+    
+    entry_cost = column(entries, 'price') * column(entries, 'quantity') + column(entries, 'commission')
+    exit_value = column(exits, 'price') * column(exits, 'quantity') - column(exits, 'commission')
+    return exit_value - entry_cost
 
 
-def generate_report(results: Dict, output_dir: Optional[Path] = None) -> BacktestReport:
+def generate_report(results: Dict, output_dir: Optional[Path] = None,
+                    exact_accounting: bool = False,
+                    echo: Optional[bool] = None) -> BacktestReport:
     """
     Generate a comprehensive backtest report.
     
     Args:
         results: Dictionary from BacktestEngine.run()
         output_dir: Optional directory to save report
+        exact_accounting: Compute per-strategy P&L in Decimal
+        echo: Print the text report to stdout. By default it is printed
+            only when stdout is a terminal or nothing is being saved.
         
     Returns:
         BacktestReport object
@@ -249,11 +358,15 @@ def generate_report(results: Dict, output_dir: Optional[Path] = None) -> Backtes
     report = BacktestReport(
         metrics=metrics,
         results=results,
-        timestamp=datetime.now()
+        timestamp=datetime.now(),
+        exact_accounting=exact_accounting
     )
     
-    # Print to console
-    print(report.to_text())
+    # Print to console; skipped when redirected and saved to files anyway
+    if echo is None:
+        echo = sys.stdout.isatty() or not output_dir
+    if echo:
+        print(report.to_text())
     
     # Save to file if directory provided
     if output_dir:
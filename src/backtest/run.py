@@ -9,6 +9,7 @@ Usage:
 """
 import sys
 import argparse
+import importlib
 import logging
 from datetime import datetime
 from decimal import Decimal
@@ -17,13 +18,8 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.backtest.engine import BacktestEngine, BacktestConfig
-from src.backtest.data import HistoricalDataLoader
-from src.backtest.report import generate_report
-from src.strategies.arbitrage import ArbitrageStrategy
-from src.strategies.market_making import MarketMakingStrategy
-from src.strategies.behavioral import BehavioralEdgeStrategy
-from src.risk.manager import RiskManager, RiskConfig
+# Engine, strategy and risk modules are imported inside the commands
+# that need them, so --help and --generate-sample start quickly
 
 # Setup logging
 logging.basicConfig(
@@ -34,10 +30,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Strategy name -> "module:ClassName", imported on first use
 AVAILABLE_STRATEGIES = {
-    'arbitrage': ArbitrageStrategy,
-    'market_making': MarketMakingStrategy,
-    'behavioral': BehavioralEdgeStrategy,
+    'arbitrage': 'src.strategies.arbitrage:ArbitrageStrategy',
+    'market_making': 'src.strategies.market_making:MarketMakingStrategy',
+    'behavioral': 'src.strategies.behavioral:BehavioralEdgeStrategy',
 }
 
 
@@ -54,6 +51,9 @@ Examples:
   # Test all strategies with custom initial balance
   python -m src.backtest.run --strategy all --start 2024-01-01 --end 2024-12-31 --balance 50000
   
+  # Backtest each strategy independently, one process per strategy
+  python -m src.backtest.run --strategy all --parallel --start 2024-01-01 --end 2024-12-31
+  
   # Use custom data file and adjust commission
   python -m src.backtest.run --strategy arbitrage --data ./mydata.csv --commission 0.02
   
@@ -90,7 +90,8 @@ Examples:
     parser.add_argument(
         '--data',
         type=str,
-        help='Path to historical data CSV file (default: auto-load from data/historical/)'
+        help='Historical data CSV or Parquet file, or a directory of them '
+             '(default: auto-load from data/historical/)'
     )
     
     parser.add_argument(
@@ -142,6 +143,30 @@ Examples:
         help='Output directory for reports (default: ./backtest_reports/)'
     )
     
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Do not print the text report (reports are still saved)'
+    )
+    
+    parser.add_argument(
+        '--exact-accounting',
+        action='store_true',
+        help='Compute per-strategy report P&L in Decimal instead of float64'
+    )
+    
+    parser.add_argument(
+        '--log-trades',
+        action='store_true',
+        help='Log every simulated entry and exit'
+    )
+    
+    parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='With --strategy all, backtest each strategy independently in its own process'
+    )
+    
     parser.add_argument(
         '--no-risk-manager',
         action='store_true',
@@ -169,12 +194,16 @@ Examples:
         help='Number of days in sample data (default: 30)'
     )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.parallel and args.strategy != 'all':
+        parser.error("--parallel requires --strategy all")
+    return args
 
 
 def generate_sample_data(args):
     """Generate sample historical data."""
     from datetime import timedelta
+    from src.backtest.data import HistoricalDataLoader
     
     output_path = Path(args.output or 'sample_data.csv')
     
@@ -194,18 +223,28 @@ def generate_sample_data(args):
     print(f"    --end {datetime.now().strftime('%Y-%m-%d')}")
 
 
-def load_strategy(strategy_name: str):
-    """Load strategy class by name."""
+def load_strategy_class(strategy_name: str):
+    """Import a strategy class by name."""
     if strategy_name not in AVAILABLE_STRATEGIES:
         raise ValueError(f"Unknown strategy: {strategy_name}")
     
-    strategy_class = AVAILABLE_STRATEGIES[strategy_name]
+    module_name, class_name = AVAILABLE_STRATEGIES[strategy_name].split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_strategy(strategy_name: str):
+    """Load strategy class by name."""
+    strategy_class = load_strategy_class(strategy_name)
     return strategy_class()
 
 
 def run_backtest(args):
     """Run the backtest."""
-    from datetime import timedelta
+    from functools import partial
+    from src.backtest.engine import BacktestEngine, BacktestConfig
+    from src.backtest.data import HistoricalDataLoader
+    from src.backtest.report import generate_report
+    from src.risk.manager import RiskManager, RiskConfig
     
     # Parse dates
     start_date = datetime.fromisoformat(args.start)
@@ -219,8 +258,21 @@ def run_backtest(args):
     )
     
     if args.data:
-        # Load specific file
-        loader.load_csv(Path(args.data))
+        data_path = Path(args.data)
+        if data_path.is_dir():
+            # Load every CSV/Parquet file in the given directory
+            loader.data_dir = data_path
+            loader.load_from_directory(
+                start_date=start_date,
+                end_date=end_date,
+                platforms=args.platforms
+            )
+        elif data_path.suffix.lower() in ('.parquet', '.pq'):
+            # Parquet pushes the date range down to the reader
+            loader.load_parquet(data_path, start_date=start_date, end_date=end_date)
+        else:
+            # Load specific CSV file
+            loader.load_csv(data_path)
     else:
         # Auto-load from directory
         loader.load_from_directory(
@@ -245,14 +297,14 @@ def run_backtest(args):
         logger.info(f"Testing strategy: {args.strategy}")
     
     # Risk manager
-    risk_manager = None
+    risk_manager_factory = None
     if not args.no_risk_manager:
         risk_config = RiskConfig(
             max_position_size=Decimal("1000"),
             max_daily_loss=Decimal("500"),
             max_total_risk=Decimal("0.20")
         )
-        risk_manager = RiskManager(risk_config)
+        risk_manager_factory = partial(RiskManager, risk_config)
         logger.info("Risk management enabled")
     
     # Backtest configuration
@@ -263,28 +315,71 @@ def run_backtest(args):
         max_positions=args.max_positions,
         commission_rate=Decimal(str(args.commission)),
         slippage_bps=Decimal(str(args.slippage)),
-        platforms=args.platforms
+        platforms=args.platforms,
+        log_trades=args.log_trades
     )
     
+    output_dir = Path(args.output or './backtest_reports')
+    
+    if args.strategy == 'all' and args.parallel:
+        run_parallel(loader, config, risk_manager_factory, output_dir, args)
+        return
+    
     # Create and run engine
     engine = BacktestEngine(
         data_loader=loader,
         strategies=strategies,
         config=config,
-        risk_manager=risk_manager
+        risk_manager=risk_manager_factory() if risk_manager_factory else None
     )
     
     logger.info("Starting backtest...")
     results = engine.run()
     
     # Generate report
-    output_dir = Path(args.output or './backtest_reports')
-    report = generate_report(results, output_dir)
+    report = generate_report(
+        results, output_dir,
+        exact_accounting=args.exact_accounting,
+        echo=False if args.quiet else None
+    )
     
     logger.info(f"\nBacktest complete!")
     logger.info(f"Reports saved to: {output_dir}")
 
 
+def run_parallel(loader, config, risk_manager_factory, output_dir: Path, args):
+    """Backtest every strategy independently across processes, one report each."""
+    import tempfile
+    from functools import partial
+    from src.backtest.report import generate_report
+    from src.backtest.sweep import load_snapshot_file, run_strategies, save_snapshot_file
+    
+    strategy_classes = {name: load_strategy_class(name) for name in AVAILABLE_STRATEGIES}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Workers read one pickled snapshot file instead of re-parsing sources
+        snapshot_file = Path(tmp) / 'snapshots.pkl'
+        save_snapshot_file(loader, snapshot_file)
+        
+        logger.info("Starting parallel backtests...")
+        results = run_strategies(
+            config,
+            partial(load_snapshot_file, snapshot_file),
+            strategy_classes,
+            risk_manager_factory
+        )
+    
+    for name, strategy_results in results.items():
+        generate_report(
+            strategy_results, output_dir / name,
+            exact_accounting=args.exact_accounting,
+            echo=False if args.quiet else None
+        )
+    
+    logger.info("\nBacktest complete!")
+    logger.info(f"Reports saved to: {output_dir}/<strategy>/")
+
+
 def main():
     """Main entry point."""
     args = parse_args()
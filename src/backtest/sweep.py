@@ -0,0 +1,156 @@
+"""
+Parameter Sweeps for Backtesting
+
+Runs independent backtests (one per BacktestConfig, or one per
+strategy) across worker processes. Each worker loads historical data
+once and reuses it for every job it is handed.
+"""
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..risk.manager import RiskManager
+from ..strategies.base import TradingStrategy
+from .data import HistoricalDataLoader
+from .engine import BacktestEngine, BacktestConfig
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, populated by _init_worker
+_worker_loader: Optional[HistoricalDataLoader] = None
+_worker_strategies_factory: Optional[Callable[[], List[TradingStrategy]]] = None
+_worker_risk_factory: Optional[Callable[[], RiskManager]] = None
+
+
+def default_workers() -> int:
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def save_snapshot_file(loader: HistoricalDataLoader, filepath: Path) -> None:
+    """Pickle a loader's snapshots so workers can skip re-parsing sources."""
+    with open(filepath, 'wb') as f:
+        pickle.dump(loader.snapshots, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_snapshot_file(filepath: Path) -> HistoricalDataLoader:
+    """Build a loaded HistoricalDataLoader from a save_snapshot_file() dump."""
+    loader = HistoricalDataLoader()
+    with open(filepath, 'rb') as f:
+        loader.snapshots = pickle.load(f)
+    loader._loaded = True
+    return loader
+
+
+def _init_worker(data_loader_factory: Callable[[], HistoricalDataLoader],
+                 strategies_factory: Optional[Callable[[], List[TradingStrategy]]],
+                 risk_manager_factory: Optional[Callable[[], RiskManager]]) -> None:
+    """Load historical data once per worker process."""
+    global _worker_loader, _worker_strategies_factory, _worker_risk_factory
+    _worker_loader = data_loader_factory()
+    _worker_strategies_factory = strategies_factory
+    _worker_risk_factory = risk_manager_factory
+
+
+def _run_one(config: BacktestConfig) -> Dict:
+    """Run a single backtest in a worker with fresh strategies and risk state."""
+    engine = BacktestEngine(
+        data_loader=_worker_loader,
+        strategies=_worker_strategies_factory(),
+        config=config,
+        risk_manager=_worker_risk_factory() if _worker_risk_factory else None
+    )
+    return engine.run()
+
+
+def _run_strategy(job: Tuple[Callable[[], TradingStrategy], BacktestConfig]) -> Dict:
+    """Run a single strategy on its own in a worker."""
+    strategy_factory, config = job
+    engine = BacktestEngine(
+        data_loader=_worker_loader,
+        strategies=[strategy_factory()],
+        config=config,
+        risk_manager=_worker_risk_factory() if _worker_risk_factory else None
+    )
+    return engine.run()
+
+
+def run_sweep(configs: List[BacktestConfig],
+              data_loader_factory: Callable[[], HistoricalDataLoader],
+              strategies_factory: Callable[[], List[TradingStrategy]],
+              risk_manager_factory: Optional[Callable[[], RiskManager]] = None,
+              max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Run one backtest per config in parallel.
+    
+    Factories are called inside the workers, so they must be picklable
+    (module-level functions or functools.partial of them). Strategies
+    and risk managers are rebuilt for every config so runs don't share
+    state.
+    
+    Args:
+        configs: Backtest configurations to evaluate
+        data_loader_factory: Returns a loaded HistoricalDataLoader
+        strategies_factory: Returns fresh strategy instances
+        risk_manager_factory: Optional, returns a fresh RiskManager
+        max_workers: Process count (default: available CPUs)
+        
+    Returns:
+        BacktestEngine.run() results, in the same order as configs
+    """
+    if not configs:
+        return []
+    
+    workers = min(max_workers or default_workers(), len(configs))
+    logger.info(f"Running {len(configs)} backtests on {workers} workers")
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(data_loader_factory, strategies_factory, risk_manager_factory)
+    ) as executor:
+        return list(executor.map(_run_one, configs))
+
+
+def run_strategies(config: BacktestConfig,
+                   data_loader_factory: Callable[[], HistoricalDataLoader],
+                   strategy_factories: Dict[str, Callable[[], TradingStrategy]],
+                   risk_manager_factory: Optional[Callable[[], RiskManager]] = None,
+                   max_workers: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Backtest each strategy independently, one process per strategy.
+    
+    Every strategy gets its own engine, balance and position limit, so
+    results match running each strategy alone rather than all of them
+    sharing one account.
+    
+    Args:
+        config: Backtest configuration shared by every run
+        data_loader_factory: Returns a loaded HistoricalDataLoader
+        strategy_factories: Strategy name -> picklable factory (e.g. the class)
+        risk_manager_factory: Optional, returns a fresh RiskManager
+        max_workers: Process count (default: available CPUs)
+        
+    Returns:
+        Strategy name -> BacktestEngine.run() results
+    """
+    if not strategy_factories:
+        return {}
+    
+    workers = min(max_workers or default_workers(), len(strategy_factories))
+    logger.info(f"Running {len(strategy_factories)} strategies on {workers} workers")
+    
+    jobs = [(factory, config) for factory in strategy_factories.values()]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(data_loader_factory, None, risk_manager_factory)
+    ) as executor:
+        results = list(executor.map(_run_strategy, jobs))
+    
+    return dict(zip(strategy_factories, results))
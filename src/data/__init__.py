@@ -4,7 +4,7 @@ PR3DICT: Market Data Module
 Market data ingestion, caching, and VWAP analysis.
 """
 
-from .cache import MarketDataCache
+from .cache import DataCache as MarketDataCache
 from .vwap import (
     VWAPCalculator,
     VWAPValidator,
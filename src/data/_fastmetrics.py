@@ -0,0 +1,97 @@
+"""
+Numba Kernels for Orderbook Metrics
+
+Compiled level walk used on every book update. Falls back to the NumPy
+fill_depth walk when Numba isn't installed.
+"""
+import logging
+import math
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    logger.debug("Numba not installed - orderbook metrics run on NumPy")
+
+
+def fill_depth(prices: np.ndarray, sizes: np.ndarray, depth: float) -> Tuple[float, float]:
+    """
+    Walk book levels in order until depth USDC has been spent.
+    
+    Args:
+        prices: Level prices, best first
+        sizes: Level sizes
+        depth: USDC to spend
+        
+    Returns:
+        (total_size, total_cost); the last level may be partially filled
+    """
+    if prices.size == 0:
+        return 0.0, 0.0
+    
+    cum_cost = np.cumsum(prices * sizes)
+    idx = int(np.searchsorted(cum_cost, depth, side="right"))
+    if idx >= cum_cost.size:
+        return float(sizes.sum()), float(cum_cost[-1])
+    
+    spent = float(cum_cost[idx - 1]) if idx else 0.0
+    return float(sizes[:idx].sum()) + (depth - spent) / float(prices[idx]), depth
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def liquidity_and_vwap(prices: np.ndarray, sizes: np.ndarray, depth: float):
+        """
+        Walk book levels in order until depth USDC has been spent.
+        
+        Args:
+            prices: float64 level prices, best first
+            sizes: float64 level sizes
+            depth: USDC to spend
+        
+        Returns:
+            (total_size, vwap); vwap is NaN when the side is empty
+        """
+        total = 0.0
+        cost = 0.0
+        for i in range(prices.size):
+            level_cost = prices[i] * sizes[i]
+            if cost + level_cost <= depth:
+                total += sizes[i]
+                cost += level_cost
+            else:
+                total += (depth - cost) / prices[i]
+                cost = depth
+                break
+        
+        if total > 0.0:
+            return total, cost / total
+        return total, np.nan
+else:
+    def liquidity_and_vwap(prices: np.ndarray, sizes: np.ndarray, depth: float):
+        """
+        Walk book levels in order until depth USDC has been spent.
+        
+        Args:
+            prices: float64 level prices, best first
+            sizes: float64 level sizes
+            depth: USDC to spend
+        
+        Returns:
+            (total_size, vwap); vwap is NaN when the side is empty
+        """
+        total, cost = fill_depth(prices, sizes, depth)
+        if total > 0.0:
+            return total, cost / total
+        return total, math.nan
+
+
+def warm_up() -> None:
+    """Compile (or load the cached build of) the kernels before live traffic."""
+    liquidity_and_vwap(np.ones(1), np.ones(1), 1.0)
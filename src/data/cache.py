@@ -9,18 +9,58 @@ Redis-based caching layer with multi-TTL for different data types:
 """
 import json
 import logging
-from typing import Optional, List, Any
+import random
+import time
+from typing import Optional, List, Any, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 try:
     import redis.asyncio as redis
+    from redis.exceptions import ResponseError
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# SETEX every KEYS[i] to ARGV[i + 1] with TTL ARGV[1], atomically
+SETEX_MANY_SCRIPT = """
+for i = 1, #KEYS do
+    redis.call('SETEX', KEYS[i], ARGV[1], ARGV[i + 1])
+end
+return #KEYS
+"""
+
+
+def _json_default(obj: Any) -> str:
+    """Serialize values the JSON encoders don't handle natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if ORJSON_AVAILABLE:
+    def _dumps(obj: Any) -> bytes:
+        """Encode a cache payload."""
+        return orjson.dumps(obj, default=_json_default)
+    
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> str:
+        """Encode a cache payload."""
+        return json.dumps(obj, default=_json_default)
+    
+    _loads = json.loads
+
 
 class DataCache:
     """
@@ -36,6 +76,14 @@ class DataCache:
     TTL_METADATA = 300
     TTL_TRADES = 3600
     
+    # Price trends keep 24 hours; the whole key expires after 25 idle hours
+    TREND_RETENTION_HOURS = 24
+    TTL_TREND = 90000
+    TREND_TRIM_PROBABILITY = 0.01
+    
+    # get_stats results are reused for this long
+    STATS_CACHE_SECONDS = 1.0
+    
     def __init__(self, redis_url: str = "redis://localhost:6379/0"):
         """
         Initialize cache.
@@ -46,6 +94,9 @@ class DataCache:
         self.redis_url = redis_url
         self._client: Optional[redis.Redis] = None
         self._enabled = REDIS_AVAILABLE
+        self._has_timeseries = False
+        self._stats_cache: Optional[Tuple[float, dict]] = None
+        self._setex_many = None
         
         if not REDIS_AVAILABLE:
             logger.warning("Redis not available - caching disabled")
@@ -58,10 +109,12 @@ class DataCache:
         try:
             self._client = await redis.from_url(
                 self.redis_url,
-                encoding="utf-8",
-                decode_responses=True
+                decode_responses=False
             )
             await self._client.ping()
+            # EVALSHA with automatic SCRIPT LOAD on NOSCRIPT
+            self._setex_many = self._client.register_script(SETEX_MANY_SCRIPT)
+            self._has_timeseries = await self._detect_timeseries()
             logger.info("Connected to Redis cache")
             return True
         except Exception as e:
@@ -69,6 +122,21 @@ class DataCache:
             self._enabled = False
             return False
     
+    async def _detect_timeseries(self) -> bool:
+        """Check whether the RedisTimeSeries module is loaded."""
+        try:
+            modules = await self._client.module_list()
+        except Exception:
+            return False
+        
+        for module in modules:
+            name = module.get(b"name", module.get("name", b""))
+            if isinstance(name, bytes):
+                name = name.decode()
+            if name == "timeseries":
+                return True
+        return False
+    
     async def disconnect(self) -> None:
         """Close Redis connection."""
         if self._client:
@@ -85,7 +153,7 @@ class DataCache:
         data = await self._client.get(key)
         
         if data:
-            return json.loads(data)
+            return _loads(data)
         return None
     
     async def set_orderbook(self, market_id: str, platform: str, orderbook: dict) -> None:
@@ -97,9 +165,60 @@ class DataCache:
         await self._client.setex(
             key,
             self.TTL_ORDERBOOK,
-            json.dumps(orderbook)
+            _dumps(orderbook)
         )
     
+    async def mget_orderbooks(self, pairs: List[Tuple[str, str]]) -> List[Optional[dict]]:
+        """
+        Get cached orderbooks for many markets in one round trip.
+        
+        Args:
+            pairs: (market_id, platform) tuples
+            
+        Returns:
+            Orderbooks in request order, None for misses
+        """
+        if not self._enabled or not pairs:
+            return [None] * len(pairs)
+        
+        keys = [f"orderbook:{platform}:{market_id}" for market_id, platform in pairs]
+        data = await self._client.mget(keys)
+        
+        return [_loads(d) if d else None for d in data]
+    
+    async def set_orderbook_raw(self, market_id: str, platform: str, payload: bytes) -> None:
+        """Cache an already-serialized orderbook with 5s TTL."""
+        if not self._enabled:
+            return
+        
+        key = f"orderbook:{platform}:{market_id}"
+        await self._client.setex(key, self.TTL_ORDERBOOK, payload)
+    
+    async def mset_orderbooks(self, items: List[Tuple[str, str, dict]]) -> None:
+        """
+        Cache many orderbooks with 5s TTL in one server-side script call.
+        
+        Args:
+            items: (market_id, platform, orderbook) tuples
+        """
+        await self.mset_orderbooks_raw([
+            (market_id, platform, _dumps(orderbook)) for market_id, platform, orderbook in items
+        ])
+    
+    async def mset_orderbooks_raw(self, items: List[Tuple[str, str, bytes]]) -> None:
+        """
+        Cache many already-serialized orderbooks with 5s TTL in one script call.
+        
+        Args:
+            items: (market_id, platform, payload) tuples
+        """
+        if not self._enabled or not items:
+            return
+        
+        keys = [f"orderbook:{platform}:{market_id}" for market_id, platform, _ in items]
+        values = [payload for _, _, payload in items]
+        await self._setex_many(keys=keys, args=[self.TTL_ORDERBOOK, *values])
+    
     # === Price Caching ===
     
     async def get_price(self, market_id: str, platform: str) -> Optional[dict]:
@@ -111,7 +230,7 @@ class DataCache:
         data = await self._client.get(key)
         
         if data:
-            return json.loads(data)
+            return _loads(data)
         return None
     
     async def set_price(self, market_id: str, platform: str, price_data: dict) -> None:
@@ -123,9 +242,23 @@ class DataCache:
         await self._client.setex(
             key,
             self.TTL_PRICE,
-            json.dumps(price_data)
+            _dumps(price_data)
         )
     
+    async def mset_prices(self, items: List[Tuple[str, str, dict]]) -> None:
+        """
+        Cache many prices with 30s TTL in one server-side script call.
+        
+        Args:
+            items: (market_id, platform, price_data) tuples
+        """
+        if not self._enabled or not items:
+            return
+        
+        keys = [f"price:{platform}:{market_id}" for market_id, platform, _ in items]
+        values = [_dumps(price_data) for _, _, price_data in items]
+        await self._setex_many(keys=keys, args=[self.TTL_PRICE, *values])
+    
     # === Market Metadata ===
     
     async def get_market_meta(self, market_id: str, platform: str) -> Optional[dict]:
@@ -137,7 +270,7 @@ class DataCache:
         data = await self._client.get(key)
         
         if data:
-            return json.loads(data)
+            return _loads(data)
         return None
     
     async def set_market_meta(self, market_id: str, platform: str, metadata: dict) -> None:
@@ -149,7 +282,7 @@ class DataCache:
         await self._client.setex(
             key,
             self.TTL_METADATA,
-            json.dumps(metadata)
+            _dumps(metadata)
         )
     
     # === Market List Caching ===
@@ -163,7 +296,7 @@ class DataCache:
         data = await self._client.get(key)
         
         if data:
-            return json.loads(data)
+            return _loads(data)
         return None
     
     async def set_market_list(self, platform: str, market_ids: List[str], category: str = "all") -> None:
@@ -175,7 +308,7 @@ class DataCache:
         await self._client.setex(
             key,
             self.TTL_METADATA,
-            json.dumps(market_ids)
+            _dumps(market_ids)
         )
     
     # === Probability Trends (Time Series) ===
@@ -184,7 +317,8 @@ class DataCache:
         """
         Add a price point to time series for trend analysis.
         
-        Stores as sorted set with timestamp scores.
+        Stores as a RedisTimeSeries series with 24h retention when the
+        module is loaded, otherwise as a sorted set with timestamp scores.
         Useful for detecting rapid price changes (overreaction).
         """
         if not self._enabled:
@@ -194,11 +328,26 @@ class DataCache:
         ts = timestamp or datetime.utcnow()
         score = ts.timestamp()
         
-        await self._client.zadd(key, {json.dumps({"price": yes_price, "ts": score}): score})
+        if self._has_timeseries:
+            try:
+                await self._ts_add(key, int(score * 1000), yes_price)
+            except ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                # Written as a sorted set before the module was loaded
+                await self._migrate_trend_key(key)
+                await self._ts_add(key, int(score * 1000), yes_price)
+            return
         
-        # Keep only last 24 hours
-        cutoff = (datetime.utcnow() - timedelta(hours=24)).timestamp()
-        await self._client.zremrangebyscore(key, 0, cutoff)
+        # Set the key TTL once (NX keeps an existing one); trim old points
+        # only occasionally
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.zadd(key, {_dumps({"price": yes_price, "ts": score}): score})
+            pipe.expire(key, self.TTL_TREND, nx=True)
+            if random.random() < self.TREND_TRIM_PROBABILITY:
+                cutoff = (datetime.utcnow() - timedelta(hours=self.TREND_RETENTION_HOURS)).timestamp()
+                pipe.zremrangebyscore(key, 0, cutoff)
+            await pipe.execute()
     
     async def get_price_trend(self, market_id: str, platform: str, hours: int = 1) -> List[dict]:
         """
@@ -212,9 +361,47 @@ class DataCache:
         key = f"trend:{platform}:{market_id}"
         cutoff = (datetime.utcnow() - timedelta(hours=hours)).timestamp()
         
+        if self._has_timeseries:
+            try:
+                samples = await self._client.execute_command("TS.RANGE", key, int(cutoff * 1000), "+")
+            except ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    # No points recorded for this market yet
+                    return []
+                # Legacy sorted-set key; read it as before until the next write migrates it
+            else:
+                return [{"price": float(value), "ts": ms / 1000} for ms, value in samples]
+        
         data = await self._client.zrangebyscore(key, cutoff, "+inf")
         
-        return [json.loads(d) for d in data]
+        return [_loads(d) for d in data]
+    
+    async def _ts_add(self, key: str, timestamp_ms: int, value: float) -> None:
+        """Append to a trend series; a second point in the same millisecond replaces the first."""
+        retention_ms = self.TREND_RETENTION_HOURS * 3600 * 1000
+        await self._client.execute_command(
+            "TS.ADD", key, timestamp_ms, value,
+            "RETENTION", retention_ms, "ON_DUPLICATE", "LAST"
+        )
+    
+    async def _migrate_trend_key(self, key: str) -> None:
+        """Convert a sorted-set trend key into a time series, keeping the retained points."""
+        cutoff = (datetime.utcnow() - timedelta(hours=self.TREND_RETENTION_HOURS)).timestamp()
+        points = [_loads(d) for d in await self._client.zrangebyscore(key, cutoff, "+inf")]
+        retention_ms = self.TREND_RETENTION_HOURS * 3600 * 1000
+        
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.execute_command(
+                "TS.CREATE", key, "RETENTION", retention_ms, "DUPLICATE_POLICY", "LAST"
+            )
+            if points:
+                samples = []
+                for point in points:
+                    samples += [key, int(point["ts"] * 1000), point["price"]]
+                pipe.execute_command("TS.MADD", *samples)
+            await pipe.execute()
+        logger.info(f"Migrated {key} to RedisTimeSeries ({len(points)} points)")
     
     # === Statistics ===
     
@@ -223,12 +410,22 @@ class DataCache:
         if not self._enabled or not self._client:
             return {"enabled": False}
         
-        info = await self._client.info("stats")
+        # Serve recent results to tight polling loops (e.g. dashboards)
+        now = time.monotonic()
+        if self._stats_cache and now - self._stats_cache[0] < self.STATS_CACHE_SECONDS:
+            return self._stats_cache[1]
+        
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.info("stats")
+            pipe.dbsize()
+            info, total_keys = await pipe.execute()
         
-        return {
+        stats = {
             "enabled": True,
-            "total_keys": await self._client.dbsize(),
+            "total_keys": total_keys,
             "hits": info.get("keyspace_hits", 0),
             "misses": info.get("keyspace_misses", 0),
             "hit_rate": info.get("keyspace_hits", 0) / max(info.get("keyspace_hits", 0) + info.get("keyspace_misses", 1), 1)
         }
+        self._stats_cache = (now, stats)
+        return stats
@@ -13,12 +13,14 @@ Features:
 - Update latency tracking
 """
 import asyncio
+import inspect
 import logging
+import time
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Optional, Dict, List, Callable
-from dataclasses import dataclass
-from collections import defaultdict
+from dataclasses import dataclass, replace
+from collections import defaultdict, deque
 
 from .websocket_client import (
     PolymarketWebSocketClient,
@@ -26,10 +28,58 @@ from .websocket_client import (
     TradeEvent,
 )
 from .cache import DataCache
+from ._fastmetrics import liquidity_and_vwap, warm_up
 
 logger = logging.getLogger(__name__)
 
 
+async def _cancel_task(task: Optional[asyncio.Task]) -> None:
+    """Cancel a background task and wait for it to finish."""
+    if task is None:
+        return
+    
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def _is_async_callback(callback: Callable) -> bool:
+    """Whether calling the callback returns a coroutine."""
+    return (inspect.iscoroutinefunction(callback)
+            or inspect.iscoroutinefunction(getattr(callback, "__call__", None)))
+
+
+async def _run_callbacks(sync_callbacks: List[Callable], async_callbacks: List[Callable],
+                         args: tuple, label: str) -> None:
+    """
+    Run sync callbacks inline, then async callbacks concurrently.
+    
+    Sync-registered callbacks that still return an awaitable (lambdas,
+    partials, decorated wrappers around coroutines) are awaited along
+    with the async ones. A slow or failing callback doesn't hold up the rest.
+    """
+    awaitables = []
+    for callback in sync_callbacks:
+        try:
+            result = callback(*args)
+        except Exception as e:
+            logger.error(f"{label} callback error: {e}")
+            continue
+        if inspect.isawaitable(result):
+            awaitables.append(result)
+    
+    awaitables.extend(callback(*args) for callback in async_callbacks)
+    if not awaitables:
+        return
+    
+    results = await asyncio.gather(*awaitables, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"{label} callback error: {result}")
+
+
 @dataclass
 class OrderBookMetrics:
     """Metrics for an orderbook."""
@@ -39,10 +89,10 @@ class OrderBookMetrics:
     spread: Optional[Decimal]
     spread_bps: Optional[int]  # basis points
     mid_price: Optional[Decimal]
-    bid_liquidity_100: Decimal  # Total size in top $100 USDC of bids
-    ask_liquidity_100: Decimal  # Total size in top $100 USDC of asks
-    vwap_buy_100: Optional[Decimal]  # VWAP for $100 buy
-    vwap_sell_100: Optional[Decimal]  # VWAP for $100 sell
+    bid_liquidity_100: float  # Total size in top $100 USDC of bids
+    ask_liquidity_100: float  # Total size in top $100 USDC of asks
+    vwap_buy_100: Optional[float]  # VWAP for $100 buy
+    vwap_sell_100: Optional[float]  # VWAP for $100 sell
     update_latency_ms: float
     last_update: datetime
     
@@ -54,10 +104,10 @@ class OrderBookMetrics:
             "spread": str(self.spread) if self.spread else None,
             "spread_bps": self.spread_bps,
             "mid_price": str(self.mid_price) if self.mid_price else None,
-            "bid_liquidity_100": str(self.bid_liquidity_100),
-            "ask_liquidity_100": str(self.ask_liquidity_100),
-            "vwap_buy_100": str(self.vwap_buy_100) if self.vwap_buy_100 else None,
-            "vwap_sell_100": str(self.vwap_sell_100) if self.vwap_sell_100 else None,
+            "bid_liquidity_100": f"{self.bid_liquidity_100:.6f}",
+            "ask_liquidity_100": f"{self.ask_liquidity_100:.6f}",
+            "vwap_buy_100": f"{self.vwap_buy_100:.6f}" if self.vwap_buy_100 else None,
+            "vwap_sell_100": f"{self.vwap_sell_100:.6f}" if self.vwap_sell_100 else None,
             "update_latency_ms": self.update_latency_ms,
             "last_update": self.last_update.isoformat(),
         }
@@ -75,6 +125,12 @@ class OrderBookManager:
     - Provide query API
     """
     
+    # Pending book writes are batched to Redis at most this often
+    FLUSH_INTERVAL_SECONDS = 0.02
+    
+    # Rewrite unchanged books to Redis this often so they don't expire
+    CACHE_REFRESH_SECONDS = DataCache.TTL_ORDERBOOK / 2
+    
     def __init__(
         self,
         asset_ids: Optional[List[str]] = None,
@@ -106,15 +162,31 @@ class OrderBookManager:
         
         # Metrics tracking
         self._metrics: Dict[str, OrderBookMetrics] = {}
-        self._update_times: Dict[str, float] = defaultdict(float)
+        self._spread_bps_total = 0
+        self._latency_total_ms = 0.0
+        self._last_digest: Dict[str, int] = {}
+        self._last_cache_write: Dict[str, datetime] = {}
+        self._update_times: Dict[str, float] = {}
         
         # Trade tracking
-        self._recent_trades: Dict[str, List[TradeEvent]] = defaultdict(list)
         self._max_trade_history = 100
+        self._recent_trades: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=self._max_trade_history)
+        )
         
-        # Callbacks
-        self._book_callbacks: List[Callable] = []
-        self._trade_callbacks: List[Callable] = []
+        # Latest snapshot per market awaiting the next cache flush
+        self._pending: Dict[str, OrderBookSnapshot] = {}
+        self._flush_event = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # WebSocket run loop, kept so stop() can cancel and await it
+        self._ws_task: Optional[asyncio.Task] = None
+        
+        # Callbacks, split into sync and async at registration
+        self._sync_book_callbacks: List[Callable] = []
+        self._async_book_callbacks: List[Callable] = []
+        self._sync_trade_callbacks: List[Callable] = []
+        self._async_trade_callbacks: List[Callable] = []
         
         # Running state
         self._running = False
@@ -126,9 +198,13 @@ class OrderBookManager:
         # Connect cache
         await self._cache.connect()
         
+        # Compile the metrics kernels before the first book arrives
+        warm_up()
+        
         # Start WebSocket client
         self._running = True
-        asyncio.create_task(self._ws_client.run())
+        self._flush_task = asyncio.create_task(self._flush_loop(), name="orderbook_flush")
+        self._ws_task = asyncio.create_task(self._ws_client.run(), name="ws_client_run")
         
         logger.info(f"OrderBook Manager started for {len(self.asset_ids)} assets")
     
@@ -138,6 +214,13 @@ class OrderBookManager:
         self._running = False
         
         await self._ws_client.disconnect()
+        await _cancel_task(self._ws_task)
+        self._ws_task = None
+        
+        await _cancel_task(self._flush_task)
+        self._flush_task = None
+        await self._flush_pending()
+        
         await self._cache.disconnect()
         
         logger.info("OrderBook Manager stopped")
@@ -145,70 +228,123 @@ class OrderBookManager:
     async def _on_book_update(self, snapshot: OrderBookSnapshot) -> None:
         """Handle orderbook update from WebSocket."""
         try:
-            # Calculate metrics
-            metrics = self._calculate_metrics(snapshot)
-            self._metrics[snapshot.asset_id] = metrics
+            asset_id = snapshot.asset_id
             
-            # Update cache
-            await self._cache.set_orderbook(
-                market_id=snapshot.market_id,
-                platform="polymarket",
-                orderbook=snapshot.to_dict(),
-            )
+            # Reuse the depth/VWAP numbers when the levels are unchanged;
+            # latency and timestamp are refreshed either way. The digest's
+            # level arrays are the ones the metric walk reads on a change.
+            digest = self._book_digest(snapshot)
+            previous = self._metrics.get(asset_id)
+            unchanged = previous is not None and self._last_digest.get(asset_id) == digest
+            if unchanged:
+                metrics = self._calculate_metrics(snapshot, previous)
+            else:
+                metrics = self._calculate_metrics(snapshot)
+                self._last_digest[asset_id] = digest
+            self._store_metrics(asset_id, metrics)
+            
+            # Queue the cache write, skipping unchanged books unless the
+            # cached copy is about to expire; the flusher coalesces repeats
+            market_id = snapshot.market_id
+            last_write = self._last_cache_write.get(market_id)
+            if (not unchanged or last_write is None
+                    or (snapshot.timestamp - last_write).total_seconds() >= self.CACHE_REFRESH_SECONDS):
+                self._pending[market_id] = snapshot
+                self._last_cache_write[market_id] = snapshot.timestamp
+                self._flush_event.set()
             
             # Trigger callbacks
-            for callback in self._book_callbacks:
-                try:
-                    await callback(snapshot, metrics)
-                except Exception as e:
-                    logger.error(f"Book callback error: {e}")
+            await _run_callbacks(
+                self._sync_book_callbacks, self._async_book_callbacks, (snapshot, metrics), "Book"
+            )
         
         except Exception as e:
             logger.error(f"Error processing book update: {e}", exc_info=True)
     
+    async def _flush_loop(self) -> None:
+        """Write queued orderbooks to the cache in batches."""
+        while self._running:
+            await self._flush_event.wait()
+            # Let a burst of updates coalesce into one round trip
+            await asyncio.sleep(self.FLUSH_INTERVAL_SECONDS)
+            self._flush_event.clear()
+            await self._flush_pending()
+    
+    async def _flush_pending(self) -> None:
+        """Write every queued orderbook in a single cache call."""
+        if not self._pending:
+            return
+        
+        pending, self._pending = self._pending, {}
+        try:
+            await self._cache.mset_orderbooks_raw([
+                (market_id, "polymarket", snapshot.to_json_bytes())
+                for market_id, snapshot in pending.items()
+            ])
+        except asyncio.CancelledError:
+            # Put the batch back for stop()'s final flush, keeping any newer books
+            for market_id, snapshot in pending.items():
+                self._pending.setdefault(market_id, snapshot)
+            raise
+        except Exception as e:
+            logger.error(f"Error flushing orderbooks to cache: {e}")
+    
     async def _on_trade(self, trade: TradeEvent) -> None:
         """Handle trade event from WebSocket."""
         try:
-            # Store recent trade
-            trades = self._recent_trades[trade.asset_id]
-            trades.append(trade)
-            
-            # Keep only recent trades
-            if len(trades) > self._max_trade_history:
-                self._recent_trades[trade.asset_id] = trades[-self._max_trade_history:]
+            # Store recent trade; the deque drops the oldest past the limit
+            self._recent_trades[trade.asset_id].append(trade)
             
             # Trigger callbacks
-            for callback in self._trade_callbacks:
-                try:
-                    await callback(trade)
-                except Exception as e:
-                    logger.error(f"Trade callback error: {e}")
+            await _run_callbacks(
+                self._sync_trade_callbacks, self._async_trade_callbacks, (trade,), "Trade"
+            )
         
         except Exception as e:
             logger.error(f"Error processing trade: {e}", exc_info=True)
     
-    def _calculate_metrics(self, snapshot: OrderBookSnapshot) -> OrderBookMetrics:
-        """Calculate orderbook metrics."""
-        import time
+    @staticmethod
+    def _book_digest(snapshot: OrderBookSnapshot) -> int:
+        """Hash of every price level, read from the snapshot's cached arrays."""
+        bid_prices, bid_sizes = snapshot.level_arrays("bids")
+        ask_prices, ask_sizes = snapshot.level_arrays("asks")
+        return hash((
+            bid_prices.tobytes(), bid_sizes.tobytes(),
+            ask_prices.tobytes(), ask_sizes.tobytes(),
+        ))
+    
+    def _calculate_metrics(self, snapshot: OrderBookSnapshot,
+                           unchanged: Optional[OrderBookMetrics] = None) -> OrderBookMetrics:
+        """
+        Calculate orderbook metrics.
         
+        Args:
+            snapshot: Current book
+            unchanged: Metrics from an update with identical levels; its
+                price, depth and VWAP fields are reused as-is
+        """
         # Track update latency
         now = time.time()
-        last_update_time = self._update_times.get(snapshot.asset_id, now)
-        latency_ms = (now - last_update_time) * 1000
+        last_update_time = self._update_times.get(snapshot.asset_id)
+        latency_ms = 0.0 if last_update_time is None else (now - last_update_time) * 1000
         self._update_times[snapshot.asset_id] = now
         
+        if unchanged is not None:
+            return replace(unchanged, update_latency_ms=latency_ms, last_update=snapshot.timestamp)
+        
         # Calculate spread in basis points
         spread_bps = None
         if snapshot.spread and snapshot.mid_price and snapshot.mid_price > 0:
             spread_bps = int((snapshot.spread / snapshot.mid_price) * 10000)
         
-        # Calculate liquidity depth (total size in top $100 USDC)
-        bid_liquidity = self._calculate_liquidity_depth(snapshot.bids, Decimal("100"))
-        ask_liquidity = self._calculate_liquidity_depth(snapshot.asks, Decimal("100"))
-        
-        # VWAP calculations
-        vwap_buy = snapshot.calculate_vwap("BUY", Decimal("100"))
-        vwap_sell = snapshot.calculate_vwap("SELL", Decimal("100"))
+        # Liquidity depth (total size in top $100 USDC) and VWAP in float64;
+        # one compiled walk per side yields both
+        bid_liquidity, vwap_sell = liquidity_and_vwap(*snapshot.level_arrays("bids"), 100.0)
+        ask_liquidity, vwap_buy = liquidity_and_vwap(*snapshot.level_arrays("asks"), 100.0)
+        if bid_liquidity <= 0:
+            vwap_sell = None
+        if ask_liquidity <= 0:
+            vwap_buy = None
         
         return OrderBookMetrics(
             asset_id=snapshot.asset_id,
@@ -225,24 +361,15 @@ class OrderBookManager:
             last_update=snapshot.timestamp,
         )
     
-    def _calculate_liquidity_depth(self, levels, depth_usdc: Decimal) -> Decimal:
-        """Calculate total size available within a USDC depth."""
-        total_size = Decimal("0")
-        remaining = depth_usdc
-        
-        for level in levels:
-            level_cost = level.price * level.size
-            
-            if level_cost <= remaining:
-                total_size += level.size
-                remaining -= level_cost
-            else:
-                # Partial fill
-                partial_size = remaining / level.price
-                total_size += partial_size
-                break
-        
-        return total_size
+    def _store_metrics(self, asset_id: str, metrics: OrderBookMetrics) -> None:
+        """Replace an asset's metrics and update the running totals for get_stats."""
+        previous = self._metrics.get(asset_id)
+        if previous is not None:
+            self._spread_bps_total -= previous.spread_bps or 0
+            self._latency_total_ms -= previous.update_latency_ms
+        self._spread_bps_total += metrics.spread_bps or 0
+        self._latency_total_ms += metrics.update_latency_ms
+        self._metrics[asset_id] = metrics
     
     # === Public API ===
     
@@ -268,8 +395,8 @@ class OrderBookManager:
     
     def get_recent_trades(self, asset_id: str, limit: int = 10) -> List[TradeEvent]:
         """Get recent trades for an asset."""
-        trades = self._recent_trades.get(asset_id, [])
-        return trades[-limit:]
+        trades = self._recent_trades.get(asset_id, ())
+        return list(trades)[-limit:]
     
     def get_best_bid_ask(self, asset_id: str) -> tuple[Optional[Decimal], Optional[Decimal]]:
         """Get best bid and ask for an asset."""
@@ -304,26 +431,32 @@ class OrderBookManager:
         """
         Register a callback for orderbook updates.
         
-        Callback signature: async def callback(snapshot: OrderBookSnapshot, metrics: OrderBookMetrics)
+        Callback signature: [async] def callback(snapshot: OrderBookSnapshot, metrics: OrderBookMetrics)
         """
-        self._book_callbacks.append(callback)
+        if _is_async_callback(callback):
+            self._async_book_callbacks.append(callback)
+        else:
+            self._sync_book_callbacks.append(callback)
     
     def register_trade_callback(self, callback: Callable) -> None:
         """
         Register a callback for trade events.
         
-        Callback signature: async def callback(trade: TradeEvent)
+        Callback signature: [async] def callback(trade: TradeEvent)
         """
-        self._trade_callbacks.append(callback)
+        if _is_async_callback(callback):
+            self._async_trade_callbacks.append(callback)
+        else:
+            self._sync_trade_callbacks.append(callback)
     
     def get_stats(self) -> dict:
         """Get comprehensive statistics."""
         ws_stats = self._ws_client.get_stats()
         
-        # Calculate metrics stats
-        metrics_list = list(self._metrics.values())
-        avg_spread_bps = sum(m.spread_bps for m in metrics_list if m.spread_bps) / len(metrics_list) if metrics_list else 0
-        avg_latency = sum(m.update_latency_ms for m in metrics_list) / len(metrics_list) if metrics_list else 0
+        # Averages come from running totals kept by _store_metrics
+        count = len(self._metrics)
+        avg_spread_bps = self._spread_bps_total / count if count else 0
+        avg_latency = self._latency_total_ms / count if count else 0
         
         return {
             **ws_stats,
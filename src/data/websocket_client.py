@@ -13,15 +13,18 @@ Features:
 - Redis integration for pub/sub
 """
 import asyncio
+import bisect
 import json
 import logging
 import time
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional, Dict, List, Callable, Set
+from typing import Optional, Dict, List, Callable, Set, Tuple
 from collections import defaultdict
 from dataclasses import dataclass, field
 
+import numpy as np
+
 try:
     import websockets
     from websockets.client import WebSocketClientProtocol
@@ -35,10 +38,16 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderBookLevel:
     """Single level in the order book."""
     price: Decimal
@@ -48,7 +57,17 @@ class OrderBookLevel:
         return hash((self.price, self.size))
 
 
-@dataclass
+def _bid_key(level: OrderBookLevel) -> Decimal:
+    """Sort key putting the highest bid first."""
+    return -level.price
+
+
+def _ask_key(level: OrderBookLevel) -> Decimal:
+    """Sort key putting the lowest ask first."""
+    return level.price
+
+
+@dataclass(slots=True)
 class OrderBookSnapshot:
     """L2 order book snapshot."""
     asset_id: str
@@ -57,30 +76,43 @@ class OrderBookSnapshot:
     asks: List[OrderBookLevel] = field(default_factory=list)
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     hash: Optional[str] = None
+    _level_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _top: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def best_bid(self) -> Optional[Decimal]:
         """Top of book bid."""
-        return self.bids[0].price if self.bids else None
+        return self._top_of_book()[0]
     
     @property
     def best_ask(self) -> Optional[Decimal]:
         """Top of book ask."""
-        return self.asks[0].price if self.asks else None
+        return self._top_of_book()[1]
     
     @property
     def spread(self) -> Optional[Decimal]:
         """Bid-ask spread."""
-        if self.best_bid and self.best_ask:
-            return self.best_ask - self.best_bid
-        return None
+        return self._top_of_book()[2]
     
     @property
     def mid_price(self) -> Optional[Decimal]:
         """Mid price."""
-        if self.best_bid and self.best_ask:
-            return (self.best_bid + self.best_ask) / 2
-        return None
+        return self._top_of_book()[3]
+    
+    def _top_of_book(self) -> tuple:
+        """(best_bid, best_ask, spread, mid_price), computed once per book state."""
+        top = self._top
+        if top is None:
+            best_bid = self.bids[0].price if self.bids else None
+            best_ask = self.asks[0].price if self.asks else None
+            if best_bid and best_ask:
+                top = (best_bid, best_ask, best_ask - best_bid, (best_bid + best_ask) / 2)
+            else:
+                top = (best_bid, best_ask, None, None)
+            self._top = top
+        return top
     
     def calculate_vwap(self, side: str, depth_usdc: Decimal = Decimal("100")) -> Optional[Decimal]:
         """
@@ -93,6 +125,7 @@ class OrderBookSnapshot:
         Returns:
             VWAP price or None if insufficient liquidity
         """
+        # Exact Decimal walk; metrics use the float64 kernel on level_arrays()
         levels = self.asks if side == "BUY" else self.bids
         
         total_cost = Decimal("0")
@@ -119,6 +152,29 @@ class OrderBookSnapshot:
             return total_cost / total_size
         return None
     
+    def level_arrays(self, side: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Price and size columns for one side of the book as float64 arrays.
+        
+        Built on first use and reused until invalidate_levels() is called
+        after the levels change.
+        
+        Args:
+            side: "bids" or "asks"
+        """
+        arrays = self._level_arrays.get(side)
+        if arrays is None:
+            levels = self.bids if side == "bids" else self.asks
+            prices = np.fromiter((float(l.price) for l in levels), dtype=np.float64, count=len(levels))
+            sizes = np.fromiter((float(l.size) for l in levels), dtype=np.float64, count=len(levels))
+            arrays = self._level_arrays[side] = (prices, sizes)
+        return arrays
+    
+    def invalidate_levels(self) -> None:
+        """Drop cached level arrays and top of book after bids/asks were modified in place."""
+        self._level_arrays.clear()
+        self._top = None
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for caching/serialization."""
         return {
@@ -133,6 +189,12 @@ class OrderBookSnapshot:
             "spread": str(self.spread) if self.spread else None,
             "mid_price": str(self.mid_price) if self.mid_price else None,
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to_dict() as UTF-8 JSON, with orjson when available."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict()).encode("utf-8")
 
 
 @dataclass
@@ -379,15 +441,18 @@ class PolymarketWebSocketClient:
         if not asset_id or not market_id:
             return
         
-        # Parse orderbook
-        bids = [
-            OrderBookLevel(Decimal(level["price"]), Decimal(level["size"]))
-            for level in data.get("bids", [])
-        ]
-        asks = [
-            OrderBookLevel(Decimal(level["price"]), Decimal(level["size"]))
-            for level in data.get("asks", [])
-        ]
+        # Parse orderbook, best level first (bids descending, asks ascending);
+        # price changes rely on this order to locate levels by bisection
+        bids = sorted(
+            (OrderBookLevel(Decimal(level["price"]), Decimal(level["size"]))
+             for level in data.get("bids", [])),
+            key=_bid_key
+        )
+        asks = sorted(
+            (OrderBookLevel(Decimal(level["price"]), Decimal(level["size"]))
+             for level in data.get("asks", [])),
+            key=_ask_key
+        )
         
         snapshot = OrderBookSnapshot(
             asset_id=asset_id,
@@ -430,31 +495,27 @@ class PolymarketWebSocketClient:
             size = Decimal(change["size"])
             side = change["side"]  # "BUY" or "SELL"
             
-            # Update the appropriate side
-            levels = book.bids if side == "BUY" else book.asks
-            
-            # Find and update level
-            updated = False
-            for i, level in enumerate(levels):
-                if level.price == price:
-                    if size == 0:
-                        # Remove level
-                        levels.pop(i)
-                    else:
-                        # Update size
-                        level.size = size
-                    updated = True
-                    break
+            # Update the appropriate side (bids descending, asks ascending)
+            if side == "BUY":
+                levels, key = book.bids, _bid_key
+            else:
+                levels, key = book.asks, _ask_key
             
-            # Add new level if not found
-            if not updated and size > 0:
-                levels.append(OrderBookLevel(price, size))
-                # Resort (bids descending, asks ascending)
-                if side == "BUY":
-                    levels.sort(key=lambda x: x.price, reverse=True)
+            # Locate the level by bisection; sides are kept sorted
+            level = OrderBookLevel(price, size)
+            i = bisect.bisect_left(levels, key(level), key=key)
+            if i < len(levels) and levels[i].price == price:
+                if size == 0:
+                    # Remove level
+                    del levels[i]
                 else:
-                    levels.sort(key=lambda x: x.price)
+                    # Update size
+                    levels[i].size = size
+            elif size > 0:
+                # Insert new level in place
+                levels.insert(i, level)
             
+            book.invalidate_levels()
             book.timestamp = datetime.now(timezone.utc)
             
             # Callback
@@ -512,13 +573,16 @@ class PolymarketWebSocketClient:
             return
         
         try:
+            # Serialize once for both the channel and the cache entry
+            payload = snapshot.to_json_bytes()
+            
             # Publish to channel
             channel = f"polymarket:orderbook:{snapshot.asset_id}"
-            await self._redis.publish(channel, json.dumps(snapshot.to_dict()))
+            await self._redis.publish(channel, payload)
             
             # Also cache in Redis with TTL
             key = f"orderbook:polymarket:{snapshot.asset_id}"
-            await self._redis.setex(key, 5, json.dumps(snapshot.to_dict()))
+            await self._redis.setex(key, 5, payload)
             
         except Exception as e:
             logger.warning(f"Redis publish failed: {e}")
@@ -13,6 +13,12 @@ from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 from .orderbook_manager import OrderBookManager
 from .websocket_client import OrderBookSnapshot, TradeEvent
 
@@ -230,4 +236,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    # libuv-backed loop for the WebSocket/Redis hot path when installed
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(main())
@@ -194,14 +194,21 @@ class TradingEngine:
             await self._scan_entries(all_markets)
     
     async def _fetch_all_markets(self) -> List[Market]:
-        """Fetch markets from all connected platforms."""
+        """Fetch markets from all connected platforms concurrently."""
+        platforms = list(self.platforms.values())
+        results = await asyncio.gather(
+            *(platform.get_markets(status="open", limit=100) for platform in platforms),
+            return_exceptions=True
+        )
+        
         markets = []
-        for platform in self.platforms.values():
-            try:
-                platform_markets = await platform.get_markets(status="open", limit=100)
-                markets.extend(platform_markets)
-            except Exception as e:
-                logger.error(f"Failed to fetch markets from {platform.name}: {e}")
+        for platform, platform_markets in zip(platforms, results):
+            if isinstance(platform_markets, asyncio.CancelledError):
+                raise platform_markets
+            if isinstance(platform_markets, BaseException):
+                logger.error(f"Failed to fetch markets from {platform.name}: {platform_markets}")
+                continue
+            markets.extend(platform_markets)
         return markets
     
     async def _fetch_all_positions(self) -> List[Position]:
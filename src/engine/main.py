@@ -9,6 +9,12 @@ import os
 import sys
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Add src to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -112,4 +118,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    # libuv-backed loop for the WebSocket/Redis/HTTP hot path when installed
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(main())
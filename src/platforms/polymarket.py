@@ -7,10 +7,11 @@ Uses USDC for settlement, py-clob-client for API access.
 Enhanced with WebSocket support for <5ms latency (vs 50-100ms REST polling).
 """
 import os
+import json
 import asyncio
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import logging
 
 from .base import (
@@ -79,6 +80,7 @@ class PolymarketPlatform(PlatformInterface):
         self.passphrase = passphrase or os.getenv("POLYMARKET_PASSPHRASE")
         
         self._client: Optional[ClobClient] = None
+        self._gamma_client = None  # httpx.AsyncClient, created on first Gamma request
         
         # WebSocket support (optional)
         self._use_websocket = use_websocket and WEBSOCKET_AVAILABLE
@@ -141,6 +143,10 @@ class PolymarketPlatform(PlatformInterface):
             await self._orderbook_manager.stop()
             self._orderbook_manager = None
         
+        if self._gamma_client:
+            await self._gamma_client.aclose()
+            self._gamma_client = None
+        
         self._client = None
         logger.info("Disconnected from Polymarket")
     
@@ -193,23 +199,22 @@ class PolymarketPlatform(PlatformInterface):
         """Fetch markets from Gamma API."""
         try:
             # Use gamma API for market discovery
-            import httpx
-            async with httpx.AsyncClient() as client:
-                params = {"limit": limit, "active": status == "open"}
-                if category:
-                    params["tag"] = category
-                
-                response = await client.get(
-                    f"{self.GAMMA_URL}/markets",
-                    params=params
-                )
-                response.raise_for_status()
-                
-                markets = []
-                for m in response.json():
-                    markets.append(self._parse_market(m))
-                return markets
-                
+            client = self._gamma_http()
+            params = {"limit": limit, "active": status == "open"}
+            if category:
+                params["tag"] = category
+            
+            response = await client.get(
+                f"{self.GAMMA_URL}/markets",
+                params=params
+            )
+            response.raise_for_status()
+            
+            markets = []
+            for m in response.json():
+                markets.append(self._parse_market(m))
+            return markets
+            
         except Exception as e:
             logger.error(f"Failed to get markets: {e}")
             return []
@@ -217,25 +222,50 @@ class PolymarketPlatform(PlatformInterface):
     async def get_market(self, market_id: str) -> Optional[Market]:
         """Get a single market by condition_id."""
         try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.GAMMA_URL}/markets/{market_id}"
-                )
-                if response.status_code == 404:
-                    return None
-                response.raise_for_status()
-                return self._parse_market(response.json())
-                
+            response = await self._gamma_http().get(
+                f"{self.GAMMA_URL}/markets/{market_id}"
+            )
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return self._parse_market(response.json())
+            
         except Exception as e:
             logger.error(f"Failed to get market {market_id}: {e}")
             return None
     
+    def _gamma_http(self):
+        """
+        Shared keep-alive client for Gamma API requests.
+        
+        Uses HTTP/2 when the h2 package is installed so concurrent
+        requests multiplex over one TLS connection.
+        """
+        if self._gamma_client is None:
+            import httpx
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+            
+            self._gamma_client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    http2=http2,
+                    limits=httpx.Limits(
+                        max_connections=16,
+                        max_keepalive_connections=16,
+                        keepalive_expiry=30.0
+                    ),
+                    retries=2
+                )
+            )
+        return self._gamma_client
+    
     def _parse_market(self, m: dict) -> Market:
         """Convert Polymarket market response to Market dataclass."""
         # Polymarket has YES and NO tokens with separate prices
-        yes_price = Decimal(str(m.get("outcomePrices", ["0.5", "0.5"])[0]))
-        no_price = Decimal(str(m.get("outcomePrices", ["0.5", "0.5"])[1]))
+        yes_price, no_price = self._parse_prices(m.get("outcomePrices"))
         
         return Market(
             id=m.get("conditionId", m.get("id", "")),
@@ -251,6 +281,25 @@ class PolymarketPlatform(PlatformInterface):
             platform=self.name
         )
     
+    @staticmethod
+    def _parse_prices(outcome_prices) -> Tuple[Decimal, Decimal]:
+        """
+        Parse outcomePrices once into (yes_price, no_price).
+        
+        Gamma returns the prices as a JSON-encoded string; an already
+        decoded list is accepted too. Missing outcomes default to 0.5.
+        """
+        if isinstance(outcome_prices, str):
+            try:
+                outcome_prices = json.loads(outcome_prices)
+            except ValueError:
+                outcome_prices = None
+        prices = outcome_prices or ()
+        
+        yes_price = Decimal(str(prices[0])) if len(prices) > 0 else Decimal("0.5")
+        no_price = Decimal(str(prices[1])) if len(prices) > 1 else Decimal("0.5")
+        return yes_price, no_price
+    
     async def get_orderbook(self, market_id: str) -> OrderBook:
         """
         Get order book from CLOB.
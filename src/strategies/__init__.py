@@ -1,11 +1,11 @@
 # Trading Strategies
-from .base import TradingStrategy, Signal
+from .base import TradingStrategy, Signal, MarketFeatures
 from .arbitrage import ArbitrageStrategy, CrossPlatformArbitrage
 from .market_making import MarketMakingStrategy, MarketMakingConfig, InventoryTracker
 from .market_rebalancing import MarketRebalancingStrategy, RebalancingConfig, RebalancingOpportunity
 
 __all__ = [
-    "TradingStrategy", "Signal",
+    "TradingStrategy", "Signal", "MarketFeatures",
     "ArbitrageStrategy", "CrossPlatformArbitrage",
     "MarketMakingStrategy", "MarketMakingConfig", "InventoryTracker",
     "MarketRebalancingStrategy", "RebalancingConfig", "RebalancingOpportunity"
@@ -25,6 +25,11 @@ class ArbitrageStrategy(TradingStrategy):
     2. Cross-Platform: Price differentials for same event
     """
     
+    # Each market is judged on its own prices (the time-to-close check reads
+    # the wall clock, not replay time) and exits are hold-to-resolution, so
+    # backtests only need to look at markets that moved
+    incremental_scan = True
+    
     def __init__(self,
                  min_spread: Decimal = Decimal("0.025"),  # 2.5% min profit
                  min_liquidity: Decimal = Decimal("1000"),
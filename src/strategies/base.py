@@ -4,14 +4,20 @@ PR3DICT: Base Strategy Interface
 Abstract base class for trading strategies.
 Follows ST0CK's Strategy Pattern for decoupled signal/execution logic.
 """
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, List
+from functools import cached_property
+from typing import Optional, List, Dict, Tuple
 from decimal import Decimal
 from datetime import datetime
 
+import numpy as np
+
 from ..platforms.base import Market, OrderSide, Position
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Signal:
@@ -30,6 +36,55 @@ class Signal:
             self.timestamp = datetime.now()
 
 
+class MarketFeatures:
+    """
+    Columnar view of one scan's markets, shared by all strategies.
+    
+    Built once per scan by the engine. Columns are computed lazily on
+    first access and cached, so strategies that never touch them pay
+    nothing; strategies that do can use vector ops (e.g.
+    ``np.flatnonzero(features.spread > 0.02)``) instead of per-market
+    Python dispatch. Row ``i`` of every column is ``markets[i]``.
+    """
+    
+    def __init__(self, markets: List[Market]):
+        self.markets = markets
+    
+    def _column(self, attr: str) -> np.ndarray:
+        return np.fromiter(
+            (float(getattr(m, attr)) for m in self.markets),
+            dtype=np.float64,
+            count=len(self.markets)
+        )
+    
+    @cached_property
+    def index(self) -> Dict[str, int]:
+        """Market id -> row number."""
+        return {m.id: i for i, m in enumerate(self.markets)}
+    
+    @cached_property
+    def yes_price(self) -> np.ndarray:
+        return self._column("yes_price")
+    
+    @cached_property
+    def no_price(self) -> np.ndarray:
+        return self._column("no_price")
+    
+    @cached_property
+    def liquidity(self) -> np.ndarray:
+        return self._column("liquidity")
+    
+    @cached_property
+    def spread(self) -> np.ndarray:
+        """Same as Market.spread: |1 - YES - NO|."""
+        return np.abs(1.0 - self.yes_price - self.no_price)
+    
+    @cached_property
+    def mid(self) -> np.ndarray:
+        """YES mid price, taking 1 - NO as the YES ask."""
+        return (self.yes_price + (1.0 - self.no_price)) / 2.0
+
+
 class TradingStrategy(ABC):
     """
     Abstract base strategy interface.
@@ -38,6 +93,11 @@ class TradingStrategy(ABC):
     the engine handles execution and lifecycle.
     """
     
+    # When True, the backtest engine only scans markets whose prices moved
+    # this tick and only checks exits on those markets. Leave False for
+    # strategies with time-based rules or per-tick state.
+    incremental_scan: bool = False
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -76,6 +136,40 @@ class TradingStrategy(ABC):
         """
         pass
     
+    async def scan_batch(self, markets: List[Market],
+                         features: MarketFeatures) -> List[Signal]:
+        """
+        Scan markets with access to the shared feature table.
+        
+        Default delegates to scan_markets(). Override to evaluate entry
+        rules as vector ops over ``features``.
+        """
+        return await self.scan_markets(markets)
+    
+    async def check_exit_batch(self,
+                               holdings: List[Tuple[Position, Market]],
+                               features: MarketFeatures) -> List[Optional[Signal]]:
+        """
+        Check exits for all of this strategy's positions in one call.
+        
+        Default calls check_exit() per position. A position whose check
+        fails with the same expected errors the backtest engine tolerates
+        (TypeError, RuntimeError) gets None so the rest of the batch still
+        exits; anything else propagates. Override to classify every
+        position at once from ``features``.
+        
+        Returns:
+            One exit signal (or None) per entry in ``holdings``
+        """
+        signals = []
+        for position, market in holdings:
+            try:
+                signals.append(await self.check_exit(position, market))
+            except (TypeError, RuntimeError) as e:
+                logger.warning(f"check_exit failed for {self.name} on {position.market_id}: {e}")
+                signals.append(None)
+        return signals
+    
     def get_position_size(self, 
                           signal: Signal, 
                           account_balance: Decimal,
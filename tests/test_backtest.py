@@ -0,0 +1,444 @@
+"""
+Tests for the backtesting engine and performance metrics.
+"""
+import json
+import pytest
+from dataclasses import replace
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import src.backtest.data as data_module
+from src.backtest.data import HistoricalDataLoader, MarketSnapshot
+from src.backtest.equity import EquityCurve
+from src.backtest.report import BacktestReport
+from src.platforms.base import Market, OrderSide
+from src.strategies.arbitrage import ArbitrageStrategy
+from src.strategies.base import MarketFeatures, Signal, TradingStrategy
+from src.backtest.metrics import (
+    _calculate_returns_series,
+    _calculate_sharpe_ratio,
+    _calculate_sortino_ratio,
+    _calculate_max_drawdown,
+    _summarize_trades,
+)
+from src.backtest.engine import BacktestConfig, BacktestEngine, BacktestPosition, BacktestTrade
+
+
+def make_market(market_id, yes_price, no_price):
+    """Build a minimal market for feature tests."""
+    return Market(
+        id=market_id,
+        ticker=market_id,
+        title=market_id,
+        description="",
+        yes_price=Decimal(yes_price),
+        no_price=Decimal(no_price),
+        volume=Decimal("1000"),
+        liquidity=Decimal("5000"),
+        close_time=datetime(2024, 12, 31),
+        resolved=False,
+        platform="kalshi"
+    )
+
+
+def make_trade(market_id, trade_type, day, price="0.50", quantity=10, strategy="test"):
+    """Build a simulated trade on the given day of January 2024."""
+    return BacktestTrade(
+        timestamp=datetime(2024, 1, day),
+        market_id=market_id,
+        ticker=market_id,
+        side=OrderSide.YES if trade_type == 'entry' else OrderSide.NO,
+        quantity=quantity,
+        price=Decimal(price),
+        commission=Decimal("0"),
+        trade_type=trade_type,
+        strategy=strategy,
+        reason=""
+    )
+
+
+def make_snapshot(market_id, hour, yes_price):
+    """Build a snapshot at the given hour of 2024-01-01."""
+    return MarketSnapshot(
+        timestamp=datetime(2024, 1, 1, hour),
+        market_id=market_id,
+        ticker=market_id,
+        title=market_id,
+        yes_price=Decimal(yes_price),
+        no_price=Decimal("1") - Decimal(yes_price),
+        volume=Decimal("1000"),
+        liquidity=Decimal("5000"),
+        close_time=datetime(2024, 12, 31),
+        resolved=False,
+        platform="kalshi"
+    )
+
+
+def make_loader(snapshots):
+    """Build a loader over in-memory snapshots."""
+    loader = HistoricalDataLoader()
+    loader.snapshots = sorted(snapshots, key=lambda s: s.timestamp)
+    loader._loaded = True
+    return loader
+
+
+class FlakyExitStrategy(TradingStrategy):
+    """Exits every position except market "BAD", whose check raises ``error``."""
+    
+    def __init__(self, error):
+        self.error = error
+    
+    @property
+    def name(self) -> str:
+        return "flaky"
+    
+    async def scan_markets(self, markets):
+        return []
+    
+    async def check_exit(self, position, market):
+        if market.id == "BAD":
+            raise self.error("bad market data")
+        return Signal(market_id=market.id, market=market, side=OrderSide.NO,
+                      strength=1.0, reason="exit")
+
+
+def make_curve(values, start=datetime(2024, 1, 1), step=timedelta(days=1)):
+    """Build an equity curve from a list of equity values."""
+    return [(start + step * i, Decimal(str(v))) for i, v in enumerate(values)]
+
+
+class TestMetrics:
+    """Test risk metric calculations on equity curves."""
+    
+    def test_returns_series(self):
+        """Test period returns are computed from consecutive points."""
+        returns = _calculate_returns_series(make_curve([100, 110, 99]))
+        
+        assert returns.tolist() == pytest.approx([0.10, -0.10])
+    
+    def test_returns_series_short_curve(self):
+        """Test curves with fewer than two points have no returns."""
+        assert _calculate_returns_series(make_curve([100])).size == 0
+    
+    def test_max_drawdown_and_duration(self):
+        """Test drawdown is measured from the running peak to the trough."""
+        curve = make_curve([100, 120, 110, 90, 130, 125])
+        
+        max_dd, duration = _calculate_max_drawdown(curve)
+        
+        assert float(max_dd) == pytest.approx(0.25)
+        assert duration == timedelta(days=2)
+    
+    def test_max_drawdown_monotonic_curve(self):
+        """Test a curve that never falls has no drawdown."""
+        max_dd, duration = _calculate_max_drawdown(make_curve([100, 101, 102]))
+        
+        assert max_dd == Decimal("0")
+        assert duration == timedelta(0)
+    
+    def test_sharpe_ratio_flat_returns(self):
+        """Test zero volatility yields a zero Sharpe ratio."""
+        returns = _calculate_returns_series(make_curve([100, 100, 100]))
+        
+        assert _calculate_sharpe_ratio(returns) == Decimal("0")
+    
+    def test_sortino_ratio_no_downside(self):
+        """Test Sortino is capped when there are no losing periods."""
+        returns = _calculate_returns_series(make_curve([100, 105, 110]))
+        
+        assert _calculate_sortino_ratio(returns) == Decimal("999")
+    
+    def test_summarize_trades_pairs_fifo(self):
+        """Test re-entries in the same market pair with the next exit."""
+        trades = [
+            make_trade("A", 'entry', 1, price="0.40"),
+            make_trade("A", 'exit', 2, price="0.50"),
+            make_trade("B", 'entry', 2, price="0.50"),
+            make_trade("A", 'entry', 3, price="0.60"),
+            make_trade("B", 'exit', 4, price="0.45"),
+            make_trade("A", 'exit', 5, price="0.70"),
+        ]
+        
+        summary = _summarize_trades(trades)
+        
+        assert summary.exits == 3
+        assert summary.paired == 3
+        assert summary.winning_count == 2
+        assert summary.gross_profit == Decimal("2.0")
+        assert summary.gross_loss == Decimal("-0.5")
+        assert summary.duration_seconds == timedelta(days=5).total_seconds()
+        assert summary.max_concurrent == 2
+    
+    def test_summarize_trades_requires_earlier_entry(self):
+        """Test an exit without a prior entry in its market is unmatched."""
+        summary = _summarize_trades([make_trade("A", 'entry', 3), make_trade("A", 'exit', 3)])
+        
+        assert summary.exits == 1
+        assert summary.paired == 0
+
+
+class TestEquityCurve:
+    """Test the columnar equity curve storage."""
+    
+    def test_append_grows_capacity(self):
+        """Test appending past the initial capacity keeps every point."""
+        curve = EquityCurve(capacity=2)
+        for point in make_curve(range(100, 105)):
+            curve.append(*point)
+        
+        assert len(curve) == 5
+        assert curve.values.tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    
+    def test_tuple_access(self):
+        """Test the curve behaves like a list of (timestamp, equity) tuples."""
+        points = make_curve([100, 110, 120])
+        curve = EquityCurve()
+        for point in points:
+            curve.append(*point)
+        
+        assert curve[0] == (points[0][0], 100.0)
+        assert curve[-1] == (points[-1][0], 120.0)
+        assert curve[::2] == [(points[0][0], 100.0), (points[2][0], 120.0)]
+        assert [ts for ts, _ in curve] == [ts for ts, _ in points]
+    
+    def test_sampling_keeps_drawdown_points(self):
+        """Test sampling drops small moves but keeps peaks, troughs and the end."""
+        curve = EquityCurve(epsilon=0.05)
+        values = [100, 100.5, 101, 100.8, 100.9, 96, 100.2, 100.3]
+        for point in make_curve(values):
+            curve.record(*point)
+        curve.flush()
+        
+        assert curve.values.tolist() == [100, 100.5, 101, 100.8, 96, 100.3]
+        assert _calculate_max_drawdown(curve) == _calculate_max_drawdown(make_curve(values))
+    
+    def test_metrics_accept_equity_curve(self):
+        """Test metrics read the array buffer directly."""
+        curve = EquityCurve()
+        for point in make_curve([100, 120, 110, 90, 130, 125]):
+            curve.append(*point)
+        
+        max_dd, duration = _calculate_max_drawdown(curve)
+        
+        assert float(max_dd) == pytest.approx(0.25)
+        assert duration == timedelta(days=2)
+
+
+class TestMarketFeatures:
+    """Test the shared per-scan feature table."""
+    
+    def test_columns_match_markets(self):
+        """Test feature columns line up with the market list."""
+        markets = [make_market("A", "0.40", "0.55"), make_market("B", "0.70", "0.30")]
+        features = MarketFeatures(markets)
+        
+        assert features.index == {"A": 0, "B": 1}
+        assert features.yes_price.tolist() == pytest.approx([0.40, 0.70])
+        assert features.spread.tolist() == pytest.approx([float(m.spread) for m in markets])
+        assert features.mid.tolist() == pytest.approx([0.425, 0.70])
+
+
+class TestHistoricalDataLoader:
+    """Test chronological replay."""
+    
+    def test_replay_with_changes(self):
+        """Test only markets whose prices moved are reported as changed."""
+        loader = make_loader([
+            make_snapshot("A", 0, "0.40"), make_snapshot("B", 0, "0.60"),
+            make_snapshot("A", 1, "0.40"), make_snapshot("B", 1, "0.65"),
+            make_snapshot("A", 2, "0.45"),
+        ])
+        
+        ticks = list(loader.replay_with_changes(datetime(2024, 1, 1), datetime(2024, 1, 2)))
+        
+        assert [changed for _, _, changed in ticks] == [{"A", "B"}, {"B"}, {"A"}]
+        assert [len(markets) for _, markets, _ in ticks] == [2, 2, 1]
+    
+    def test_parquet_round_trip_with_date_filter(self, tmp_path):
+        """Test Parquet snapshots reload and honour the date range."""
+        pytest.importorskip("pyarrow")
+        source = make_loader([make_snapshot("A", hour, "0.40") for hour in range(4)])
+        path = tmp_path / "snapshots.parquet"
+        source.save_parquet(path)
+        
+        loader = HistoricalDataLoader()
+        loader.load_parquet(path, start_date=datetime(2024, 1, 1, 2))
+        
+        assert [s.timestamp.hour for s in loader.snapshots] == [2, 3]
+        assert loader.snapshots[0].yes_price == Decimal("0.40")
+        assert loader.snapshots[0].market_id == "A"
+    
+    def test_directory_with_parquet_requires_pyarrow(self, tmp_path, monkeypatch):
+        """Test Parquet files in a directory are not silently skipped without pyarrow."""
+        monkeypatch.setattr(data_module, "HAS_PYARROW", False)
+        (tmp_path / "kalshi_2024.parquet").write_bytes(b"")
+        loader = HistoricalDataLoader(data_dir=tmp_path)
+        
+        with pytest.raises(ImportError, match="1 Parquet files"):
+            loader.load_from_directory(datetime(2024, 1, 1), datetime(2024, 1, 2))
+        assert loader.snapshots == []
+    
+    def test_get_market_at_time(self):
+        """Test point lookups return the latest snapshot at or before the time."""
+        loader = make_loader([
+            make_snapshot("A", 0, "0.40"), make_snapshot("B", 1, "0.60"),
+            make_snapshot("A", 2, "0.45"), make_snapshot("A", 4, "0.50"),
+        ])
+        
+        assert loader.get_market_at_time("A", datetime(2024, 1, 1, 3)).yes_price == Decimal("0.45")
+        assert loader.get_market_at_time("A", datetime(2024, 1, 1, 4)).yes_price == Decimal("0.50")
+        assert loader.get_market_at_time("B", datetime(2024, 1, 1, 0)) is None
+        assert loader.get_market_at_time("C", datetime(2024, 1, 1, 4)) is None
+
+
+class TestBacktestReport:
+    """Test report aggregation."""
+    
+    def make_report(self, trades):
+        """Build a report over a trade log without computing metrics."""
+        return BacktestReport(metrics=None, results={'trades': trades}, timestamp=datetime(2024, 2, 1))
+    
+    def test_strategy_stats_pair_fifo_per_strategy(self):
+        """Test stats pair exits with the same strategy's oldest open entry."""
+        report = self.make_report([
+            make_trade("A", 'entry', 1, price="0.40", strategy="s1"),
+            make_trade("A", 'entry', 1, price="0.30", strategy="s2"),
+            make_trade("A", 'exit', 2, price="0.50", strategy="s1"),
+            make_trade("A", 'entry', 3, price="0.60", strategy="s1"),
+            make_trade("A", 'exit', 4, price="0.50", strategy="s1"),
+            make_trade("B", 'exit', 4, price="0.50", strategy="s2"),
+        ])
+        
+        stats = report._calculate_strategy_stats()
+        
+        assert stats["s1"]['trades'] == 2
+        assert stats["s1"]['win_rate'] == Decimal("0.5")
+        assert stats["s1"]['avg_pnl'] == Decimal("0")
+        assert stats["s2"] == {'trades': 1, 'win_rate': Decimal("0"), 'avg_pnl': Decimal("0")}
+    
+    def test_strategy_stats_exact_accounting_matches_float(self):
+        """Test Decimal and float64 P&L paths agree on a round trip."""
+        trades = [
+            make_trade("A", 'entry', 1, price="0.35", strategy="s1"),
+            make_trade("A", 'exit', 2, price="0.55", strategy="s1"),
+        ]
+        report = self.make_report(trades)
+        exact = self.make_report(trades)
+        exact.exact_accounting = True
+        
+        fast_pnl = report._calculate_strategy_stats()["s1"]['avg_pnl']
+        exact_pnl = exact._calculate_strategy_stats()["s1"]['avg_pnl']
+        
+        assert exact_pnl == Decimal("2.00")
+        assert abs(fast_pnl - exact_pnl) < Decimal("1e-9")
+    
+    def test_equity_sparkline_glyphs(self):
+        """Test equity values map to glyphs by tenths of the range, capped at the top glyph."""
+        report = BacktestReport(metrics=None, results={'equity_curve': make_curve([100, 105, 110, 200])},
+                                timestamp=datetime(2024, 2, 1))
+        
+        lines = report._generate_equity_sparkline().splitlines()
+        
+        assert lines[0].startswith("$200")
+        assert lines[1].endswith(" ▁█")
+        assert lines[2].startswith("$100")
+    
+    def test_json_rounds_metrics_and_equity(self):
+        """Test metrics and equity are written to 6 decimal places without float noise."""
+        curve = EquityCurve()
+        curve.append(datetime(2024, 1, 1), 0.1 + 0.2)
+        metrics = SimpleNamespace(
+            total_return=Decimal("0.0123456789"), annualized_return=0.1 + 0.2,
+            sharpe_ratio=Decimal("1.5"), sortino_ratio=Decimal("999"), max_drawdown=0.05,
+            win_rate=Decimal("0.5"), total_trades=2, profit_factor=Decimal("1"),
+        )
+        report = BacktestReport(metrics=metrics, results={'trades': [], 'equity_curve': curve},
+                                timestamp=datetime(2024, 2, 1))
+        
+        data = json.loads(report.to_json())
+        
+        assert data['metrics']['total_return'] == "0.012346"
+        assert data['metrics']['annualized_return'] == "0.300000"
+        assert data['metrics']['sortino_ratio'] == "999.000000"
+        assert data['metrics']['total_trades'] == 2
+        assert data['equity_curve'] == [{'timestamp': "2024-01-01T00:00:00", 'equity': "0.300000"}]
+    
+    def test_flat_equity_sparkline(self):
+        """Test a flat curve draws a mid-height line."""
+        report = BacktestReport(metrics=None, results={'equity_curve': make_curve([100] * 3)},
+                                timestamp=datetime(2024, 2, 1))
+        
+        assert "│ ▅▅▅" in report._generate_equity_sparkline()
+
+
+class TestBacktestEngine:
+    """Test the engine's strategy dispatch."""
+    
+    def make_flaky_engine(self, error):
+        """Engine holding positions in markets "BAD" and "OK" for FlakyExitStrategy."""
+        config = BacktestConfig(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 2))
+        engine = BacktestEngine(make_loader([]), [FlakyExitStrategy(error)], config)
+        markets = [make_market("BAD", "0.40", "0.60"), make_market("OK", "0.40", "0.60")]
+        for position_id, market in enumerate(markets, start=1):
+            engine.positions[position_id] = BacktestPosition(
+                market_id=market.id, ticker=market.id, side=OrderSide.YES, quantity=10,
+                entry_price=Decimal("0.40"), entry_time=datetime(2024, 1, 1),
+                strategy="flaky", platform="kalshi", position_id=position_id
+            )
+        return engine, {m.id: m for m in markets}, MarketFeatures(markets)
+    
+    def test_exit_expected_error_only_drops_failing_position(self):
+        """Test an expected check_exit error skips that position and still exits the others."""
+        engine, markets, features = self.make_flaky_engine(RuntimeError)
+        
+        try:
+            engine._check_exits(datetime(2024, 1, 1, 1), markets, features)
+        finally:
+            engine._close_loop()
+        
+        assert [p.market_id for p in engine.positions.values()] == ["BAD"]
+        assert [(t.market_id, t.trade_type) for t in engine.trades] == [("OK", "exit")]
+    
+    def test_exit_bug_propagates(self):
+        """Test an unexpected check_exit error aborts instead of holding the position."""
+        engine, markets, features = self.make_flaky_engine(ValueError)
+        
+        try:
+            with pytest.raises(ValueError, match="bad market data"):
+                engine._check_exits(datetime(2024, 1, 1, 1), markets, features)
+        finally:
+            engine._close_loop()
+        
+        assert engine.trades == []
+    
+    def test_arbitrage_incremental_scan_matches_full_scan(self):
+        """Test scanning only changed markets gives the full scan's signals for those markets."""
+        strategy = ArbitrageStrategy()
+        close_time = datetime.now() + timedelta(days=1)
+        markets = [
+            replace(make_market(market_id, yes, no), close_time=close_time)
+            for market_id, yes, no in [("A", "0.40", "0.55"), ("B", "0.45", "0.45"),
+                                       ("C", "0.50", "0.50"), ("D", "0.60", "0.45")]
+        ]
+        changed_ids = {"B", "C", "D"}
+        engine = BacktestEngine(make_loader([]), [strategy], BacktestConfig(
+            start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 2)))
+        
+        def signal_keys(signals):
+            return [(s.market_id, s.side, s.strength, s.reason) for s in signals]
+        
+        try:
+            full = engine._run_async(strategy.scan_markets(markets))
+            engine._scan_entries(datetime(2024, 1, 1), markets, MarketFeatures(markets), changed_ids)
+        finally:
+            engine._close_loop()
+        
+        assert strategy.incremental_scan
+        expected = [s for s in full if s.market_id in changed_ids]
+        assert {s.market_id for s in full} == {"A", "B", "D"}
+        assert [(t.market_id, t.side, t.trade_type) for t in engine.trades] == [
+            (s.market_id, s.side, "entry") for s in expected
+        ]
+        assert signal_keys(engine._run_async(strategy.scan_markets(
+            [m for m in markets if m.id in changed_ids]))) == signal_keys(expected)
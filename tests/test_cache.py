@@ -0,0 +1,265 @@
+"""
+Tests for the Redis market data cache, against an in-memory fake client.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from redis.exceptions import ResponseError
+
+from src.data.cache import DataCache, SETEX_MANY_SCRIPT, _dumps, _loads
+
+
+class FakePipeline:
+    """Queues commands and runs them against the fake client on execute()."""
+    
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        return lambda *args, **kwargs: self._calls.append((method, args, kwargs))
+    
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self._calls]
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio commands DataCache uses."""
+    
+    def __init__(self):
+        self.strings = {}
+        self.ttls = {}
+        self.zsets = {}
+        self.series = {}
+        self.calls = []
+    
+    def _check_type(self, key, store):
+        for other in (self.strings, self.zsets, self.series):
+            if other is not store and key in other:
+                raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+    
+    async def get(self, key):
+        self.calls.append("get")
+        return self.strings.get(key)
+    
+    async def setex(self, key, ttl, value):
+        self.calls.append("setex")
+        self.strings[key] = value
+        self.ttls[key] = ttl
+    
+    async def mget(self, keys):
+        self.calls.append("mget")
+        return [self.strings.get(key) for key in keys]
+    
+    async def delete(self, key):
+        for store in (self.strings, self.zsets, self.series):
+            store.pop(key, None)
+    
+    async def zadd(self, key, mapping):
+        self._check_type(key, self.zsets)
+        self.zsets.setdefault(key, {}).update(mapping)
+    
+    async def expire(self, key, ttl, nx=False):
+        self.calls.append("expire nx" if nx else "expire")
+        if nx and key in self.ttls:
+            return False
+        self.ttls[key] = ttl
+        return True
+    
+    async def zrangebyscore(self, key, low, high):
+        self._check_type(key, self.zsets)
+        high = float(high)
+        members = self.zsets.get(key, {})
+        return [m for m, score in sorted(members.items(), key=lambda item: item[1]) if low <= score <= high]
+    
+    async def zremrangebyscore(self, key, low, high):
+        members = self.zsets.get(key, {})
+        for member in [m for m, score in members.items() if low <= score <= high]:
+            del members[member]
+    
+    async def execute_command(self, command, *args):
+        if command == "TS.ADD":
+            key, ts, value = args[:3]
+            self._check_type(key, self.series)
+            series = self.series.setdefault(key, {})
+            if ts in series and "ON_DUPLICATE" not in args:
+                raise ResponseError("TSDB: Error at upsert, update is not supported when DUPLICATE_POLICY is set to BLOCK mode")
+            series[ts] = value
+            return ts
+        if command == "TS.RANGE":
+            key, start = args[:2]
+            self._check_type(key, self.series)
+            if key not in self.series:
+                raise ResponseError("TSDB: the key does not exist")
+            return [[ts, str(v).encode()] for ts, v in sorted(self.series[key].items()) if ts >= start]
+        if command == "TS.CREATE":
+            self.series[args[0]] = {}
+            return b"OK"
+        if command == "TS.MADD":
+            for i in range(0, len(args), 3):
+                key, ts, value = args[i:i + 3]
+                self.series.setdefault(key, {})[ts] = value
+            return []
+        raise NotImplementedError(command)
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    def register_script(self, script):
+        assert script == SETEX_MANY_SCRIPT
+        
+        async def setex_many(keys, args):
+            self.calls.append("evalsha")
+            ttl, values = args[0], args[1:]
+            for key, value in zip(keys, values):
+                self.strings[key] = value
+                self.ttls[key] = ttl
+            return len(keys)
+        return setex_many
+
+
+def make_cache(timeseries=False):
+    """Build a DataCache wired to a fresh fake Redis client."""
+    cache = DataCache()
+    cache._client = FakeRedis()
+    cache._enabled = True
+    cache._has_timeseries = timeseries
+    cache._setex_many = cache._client.register_script(SETEX_MANY_SCRIPT)
+    return cache
+
+
+class TestBatching:
+    """Test the multi-key read and write helpers."""
+    
+    @pytest.mark.asyncio
+    async def test_mget_orderbooks_single_round_trip(self):
+        """Test hits and misses come back in request order from one MGET."""
+        cache = make_cache()
+        await cache.set_orderbook("m1", "polymarket", {"bids": [["0.40", "10"]]})
+        await cache.set_orderbook("m3", "kalshi", {"asks": []})
+        cache._client.calls.clear()
+        
+        books = await cache.mget_orderbooks([("m1", "polymarket"), ("m2", "polymarket"), ("m3", "kalshi")])
+        
+        assert books == [{"bids": [["0.40", "10"]]}, None, {"asks": []}]
+        assert cache._client.calls == ["mget"]
+    
+    @pytest.mark.asyncio
+    async def test_mget_orderbooks_disabled_or_empty(self):
+        """Test no Redis call is made when there is nothing to fetch."""
+        cache = make_cache()
+        
+        assert await cache.mget_orderbooks([]) == []
+        cache._enabled = False
+        assert await cache.mget_orderbooks([("m1", "polymarket")]) == [None]
+        assert cache._client.calls == []
+    
+    @pytest.mark.asyncio
+    async def test_mset_prices_uses_script_with_price_ttl(self):
+        """Test every price is written by one script call with the 30s TTL."""
+        cache = make_cache()
+        
+        await cache.mset_prices([
+            ("m1", "polymarket", {"yes": 0.4}),
+            ("m2", "kalshi", {"yes": 0.6}),
+        ])
+        
+        assert cache._client.calls == ["evalsha"]
+        assert cache._client.ttls == {"price:polymarket:m1": 30, "price:kalshi:m2": 30}
+        assert await cache.get_price("m2", "kalshi") == {"yes": 0.6}
+    
+    @pytest.mark.asyncio
+    async def test_mset_orderbooks_uses_script_with_orderbook_ttl(self):
+        """Test dict and pre-serialized orderbooks share the 5s TTL script path."""
+        cache = make_cache()
+        
+        await cache.mset_orderbooks([("m1", "polymarket", {"bids": []})])
+        await cache.mset_orderbooks_raw([("m2", "polymarket", _dumps({"asks": []}))])
+        
+        assert cache._client.calls == ["evalsha", "evalsha"]
+        assert cache._client.ttls == {"orderbook:polymarket:m1": 5, "orderbook:polymarket:m2": 5}
+        assert _loads(cache._client.strings["orderbook:polymarket:m2"]) == {"asks": []}
+    
+    @pytest.mark.asyncio
+    async def test_mset_skips_empty_batches(self):
+        """Test empty or disabled writes never reach Redis."""
+        cache = make_cache()
+        
+        await cache.mset_prices([])
+        await cache.mset_orderbooks_raw([])
+        cache._enabled = False
+        await cache.mset_prices([("m1", "polymarket", {"yes": 0.4})])
+        
+        assert cache._client.calls == []
+        assert cache._client.strings == {}
+
+
+class TestPriceTrends:
+    """Test the RedisTimeSeries and sorted-set trend paths."""
+    
+    @pytest.mark.asyncio
+    async def test_timeseries_empty_market_has_no_trend(self):
+        """Test a market without points returns an empty trend instead of raising."""
+        cache = make_cache(timeseries=True)
+        
+        assert await cache.get_price_trend("m", "polymarket") == []
+    
+    @pytest.mark.asyncio
+    async def test_timeseries_duplicate_timestamp_keeps_last(self):
+        """Test two points in the same millisecond don't raise and the later one wins."""
+        cache = make_cache(timeseries=True)
+        ts = datetime.utcnow()
+        
+        await cache.add_price_point("m", "polymarket", 0.40, timestamp=ts)
+        await cache.add_price_point("m", "polymarket", 0.45, timestamp=ts)
+        
+        trend = await cache.get_price_trend("m", "polymarket")
+        assert [point["price"] for point in trend] == [0.45]
+    
+    @pytest.mark.asyncio
+    async def test_legacy_sorted_set_key_is_migrated(self):
+        """Test a trend written as a sorted set is readable and converted on the next write."""
+        cache = make_cache()
+        earlier = datetime.utcnow() - timedelta(minutes=5)
+        await cache.add_price_point("m", "polymarket", 0.40, timestamp=earlier)
+        cache._has_timeseries = True
+        
+        assert [p["price"] for p in await cache.get_price_trend("m", "polymarket")] == [0.40]
+        
+        await cache.add_price_point("m", "polymarket", 0.50)
+        
+        assert "trend:polymarket:m" in cache._client.series
+        assert "trend:polymarket:m" not in cache._client.zsets
+        trend = await cache.get_price_trend("m", "polymarket")
+        assert [point["price"] for point in trend] == [0.40, 0.50]
+    
+    @pytest.mark.asyncio
+    async def test_sorted_set_ttl_is_set_once(self):
+        """Test later points don't push back the expiry set by the first one."""
+        cache = make_cache()
+        
+        await cache.add_price_point("m", "polymarket", 0.40)
+        cache._client.ttls["trend:polymarket:m"] = 10
+        await cache.add_price_point("m", "polymarket", 0.45)
+        
+        assert cache._client.ttls["trend:polymarket:m"] == 10
+        assert cache._client.calls.count("expire nx") == 2
+        assert "expire" not in cache._client.calls
+    
+    @pytest.mark.asyncio
+    async def test_sorted_set_trend_round_trip(self):
+        """Test the sorted-set fallback stores points and refreshes the key TTL."""
+        cache = make_cache()
+        
+        await cache.add_price_point("m", "polymarket", 0.40)
+        
+        assert cache._client.ttls["trend:polymarket:m"] == DataCache.TTL_TREND
+        trend = await cache.get_price_trend("m", "polymarket")
+        assert [point["price"] for point in trend] == [0.40]
@@ -0,0 +1,210 @@
+"""
+Tests for the real-time orderbook manager.
+"""
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import src.data.orderbook_manager as orderbook_manager
+from src.data.orderbook_manager import OrderBookManager
+from src.data.websocket_client import OrderBookLevel, OrderBookSnapshot, TradeEvent
+
+
+def make_trade(asset_id="a", price="0.50"):
+    """Build a trade event for an asset."""
+    return TradeEvent(
+        asset_id=asset_id,
+        market_id="m",
+        price=Decimal(price),
+        size=Decimal("10"),
+        side="BUY",
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def make_book(bids, asks, second=0):
+    """Build a snapshot from (price, size) string pairs, best level first."""
+    return OrderBookSnapshot(
+        asset_id="a",
+        market_id="m",
+        bids=[OrderBookLevel(Decimal(p), Decimal(s)) for p, s in bids],
+        asks=[OrderBookLevel(Decimal(p), Decimal(s)) for p, s in asks],
+        timestamp=datetime(2024, 1, 1, 0, 0, second, tzinfo=timezone.utc),
+    )
+
+
+class TestBookUpdates:
+    """Test metric gating on unchanged books."""
+    
+    @pytest.fixture
+    def walks(self, monkeypatch):
+        """Count calls to the depth/VWAP kernel."""
+        calls = []
+        kernel = orderbook_manager.liquidity_and_vwap
+        
+        def counting(*args):
+            calls.append(args)
+            return kernel(*args)
+        monkeypatch.setattr(orderbook_manager, "liquidity_and_vwap", counting)
+        return calls
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_book_reuses_depth_but_refreshes_time(self, walks, monkeypatch):
+        """Test identical levels skip the walk but still advance timestamp and latency."""
+        clock = iter([100.0, 100.25])
+        monkeypatch.setattr(orderbook_manager, "time", SimpleNamespace(time=lambda: next(clock)))
+        manager = OrderBookManager(asset_ids=["a"])
+        levels = ([("0.40", "100")], [("0.60", "50")])
+        
+        await manager._on_book_update(make_book(*levels, second=1))
+        first = manager.get_metrics("a")
+        await manager._on_book_update(make_book(*levels, second=2))
+        second = manager.get_metrics("a")
+        
+        assert len(walks) == 2
+        assert second.last_update > first.last_update
+        assert second.update_latency_ms == pytest.approx(250.0)
+        assert second.bid_liquidity_100 == first.bid_liquidity_100 == pytest.approx(100.0)
+        assert second.vwap_buy_100 == pytest.approx(0.60)
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_book_skips_cache_write(self):
+        """Test an identical book is not queued again until the cached copy nears expiry."""
+        manager = OrderBookManager(asset_ids=["a"])
+        writes = []
+        
+        async def record_write(items):
+            writes.append([market_id for market_id, _, _ in items])
+        
+        manager._cache = SimpleNamespace(mset_orderbooks_raw=record_write)
+        levels = ([("0.40", "100")], [("0.60", "50")])
+        refresh = int(OrderBookManager.CACHE_REFRESH_SECONDS) + 1
+        
+        for second in (0, 1, 2, refresh):
+            await manager._on_book_update(make_book(*levels, second=second))
+            await manager._flush_pending()
+        
+        assert writes == [["m"], ["m"]]
+    
+    @pytest.mark.asyncio
+    async def test_changed_book_is_queued(self):
+        """Test every changed book is queued for the cache."""
+        manager = OrderBookManager(asset_ids=["a"])
+        
+        await manager._on_book_update(make_book([("0.40", "100")], [("0.60", "50")], second=0))
+        manager._pending.clear()
+        changed = make_book([("0.40", "10")], [("0.60", "50")], second=1)
+        await manager._on_book_update(changed)
+        
+        assert manager._pending == {"m": changed}
+    
+    @pytest.mark.asyncio
+    async def test_metrics_dict_formats_floats(self):
+        """Test float depth and VWAP fields are written to 6 decimal places."""
+        manager = OrderBookManager(asset_ids=["a"])
+        
+        await manager._on_book_update(make_book([("0.2", "1"), ("0.1", "1")], [("0.30", "10")]))
+        data = manager.get_metrics("a").to_dict()
+        
+        assert data["bid_liquidity_100"] == "2.000000"
+        assert data["vwap_sell_100"] == "0.150000"
+        assert data["vwap_buy_100"] == "0.300000"
+    
+    @pytest.mark.asyncio
+    async def test_changed_book_recomputes(self, walks):
+        """Test a changed level runs the walk again."""
+        manager = OrderBookManager(asset_ids=["a"])
+        
+        await manager._on_book_update(make_book([("0.40", "100")], [("0.60", "50")]))
+        await manager._on_book_update(make_book([("0.40", "10")], [("0.60", "50")]))
+        
+        assert len(walks) == 4
+        assert manager.get_metrics("a").bid_liquidity_100 == pytest.approx(10.0)
+
+
+class TestCallbacks:
+    """Test callback registration and dispatch."""
+    
+    @pytest.mark.asyncio
+    async def test_sync_and_async_callbacks(self):
+        """Test plain functions are called and coroutine functions awaited."""
+        manager = OrderBookManager(asset_ids=["a"])
+        seen = []
+        
+        async def on_trade_async(trade):
+            seen.append(("async", trade.asset_id))
+        
+        manager.register_trade_callback(lambda trade: seen.append(("sync", trade.asset_id)))
+        manager.register_trade_callback(on_trade_async)
+        await manager._on_trade(make_trade())
+        
+        assert sorted(seen) == [("async", "a"), ("sync", "a")]
+    
+    @pytest.mark.asyncio
+    async def test_lambda_returning_coroutine_is_awaited(self):
+        """Test a sync-looking wrapper around a coroutine still runs it."""
+        manager = OrderBookManager(asset_ids=["a"])
+        seen = []
+        
+        async def handler(trade):
+            seen.append(trade.price)
+        
+        manager.register_trade_callback(lambda trade: handler(trade))
+        await manager._on_trade(make_trade(price="0.42"))
+        
+        assert seen == [Decimal("0.42")]
+    
+    @pytest.mark.asyncio
+    async def test_failing_callback_does_not_block_others(self):
+        """Test one callback raising leaves the others running."""
+        manager = OrderBookManager(asset_ids=["a"])
+        seen = []
+        
+        async def broken(trade):
+            raise ValueError("boom")
+        
+        manager.register_trade_callback(broken)
+        manager.register_trade_callback(lambda trade: seen.append(trade.asset_id))
+        await manager._on_trade(make_trade())
+        
+        assert seen == ["a"]
+
+
+class TestFlush:
+    """Test batched cache writes."""
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_requeues_batch(self):
+        """Test a flush cancelled mid-write keeps its books, without clobbering newer ones."""
+        manager = OrderBookManager(asset_ids=["a"])
+        written = []
+        started = asyncio.Event()
+        
+        async def blocked_write(items):
+            started.set()
+            await asyncio.Event().wait()
+        
+        async def record_write(items):
+            written.extend(items)
+        
+        old, newer = make_book([("0.40", "100")], []), make_book([("0.41", "100")], [])
+        other = make_book([("0.40", "100")], [])
+        other.market_id = "n"
+        manager._pending = {"m": old, "n": other}
+        manager._cache = SimpleNamespace(mset_orderbooks_raw=blocked_write)
+        
+        flush = asyncio.create_task(manager._flush_pending())
+        await started.wait()
+        manager._pending["m"] = newer
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+        
+        assert manager._pending == {"m": newer, "n": other}
+        
+        manager._cache = SimpleNamespace(mset_orderbooks_raw=record_write)
+        await manager._flush_pending()
+        assert sorted(market_id for market_id, _, _ in written) == ["m", "n"]
+        assert manager._pending == {}
@@ -5,6 +5,7 @@ Comprehensive testing for VWAP calculation, validation, and integration.
 """
 
 import pytest
+import numpy as np
 from decimal import Decimal
 from datetime import datetime, timezone
 
@@ -16,6 +17,8 @@ from src.data.vwap import (
     LiquidityMetrics,
     quick_vwap_check
 )
+from src.data._fastmetrics import fill_depth, liquidity_and_vwap
+from src.data.websocket_client import OrderBookLevel, OrderBookSnapshot
 from src.platforms.base import OrderBook, OrderSide
 
 
@@ -397,5 +400,46 @@ class TestQuickVWAPCheck:
         assert result.vwap_price == Decimal("0.51")
 
 
+class TestOrderBookDepth:
+    """Test the float64 level walk behind orderbook metrics."""
+    
+    @pytest.mark.parametrize("depth", [0.0, 20.0, 45.0, 100.0, 1000.0])
+    def test_kernel_matches_fill_depth(self, depth):
+        """Test the compiled walk agrees with the NumPy walk, partial fills included."""
+        prices = np.array([0.40, 0.45, 0.50])
+        sizes = np.array([50.0, 100.0, 20.0])
+        
+        total, vwap = liquidity_and_vwap(prices, sizes, depth)
+        expected_total, expected_cost = fill_depth(prices, sizes, depth)
+        
+        assert total == pytest.approx(expected_total)
+        if expected_total > 0:
+            assert vwap == pytest.approx(expected_cost / expected_total)
+        else:
+            assert np.isnan(vwap)
+    
+    def test_snapshot_vwap_is_exact_decimal(self):
+        """Test the public snapshot VWAP stays in exact Decimal arithmetic."""
+        snapshot = OrderBookSnapshot(
+            asset_id="a",
+            market_id="m",
+            bids=[OrderBookLevel(Decimal("0.48"), Decimal("100"))],
+            asks=[OrderBookLevel(Decimal("0.52"), Decimal("10")), OrderBookLevel(Decimal("0.53"), Decimal("500"))],
+        )
+        
+        assert snapshot.calculate_vwap("SELL", Decimal("48")) == Decimal("0.48")
+        assert snapshot.calculate_vwap("BUY", Decimal("5.2")) == Decimal("0.52")
+        assert snapshot.calculate_vwap("BUY", Decimal("100")) == Decimal("100") / (
+            Decimal("10") + (Decimal("100") - Decimal("5.2")) / Decimal("0.53")
+        )
+    
+    def test_kernel_empty_side(self):
+        """Test an empty side has no liquidity and no VWAP."""
+        total, vwap = liquidity_and_vwap(np.empty(0), np.empty(0), 100.0)
+        
+        assert total == 0.0
+        assert np.isnan(vwap)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Tests for the Polymarket WebSocket client's local orderbook state.
+"""
+import pytest
+from decimal import Decimal
+
+from src.data.websocket_client import PolymarketWebSocketClient
+
+
+def levels(side):
+    """(price, size) string pairs for a book side, in stored order."""
+    return [(str(level.price), str(level.size)) for level in side]
+
+
+def change(price, size, side):
+    """Build a price_change message for asset "a"."""
+    return {
+        "market": "m",
+        "price_changes": [{"asset_id": "a", "price": price, "size": size, "side": side}],
+    }
+
+
+async def make_client():
+    """Client holding an unsorted snapshot for asset "a"."""
+    client = PolymarketWebSocketClient(asset_ids=["a"])
+    await client._handle_book({
+        "asset_id": "a",
+        "market": "m",
+        "bids": [{"price": "0.40", "size": "10"}, {"price": "0.45", "size": "5"}],
+        "asks": [{"price": "0.60", "size": "7"}, {"price": "0.55", "size": "3"}],
+    })
+    return client
+
+
+class TestPriceChanges:
+    """Test incremental level updates against a stored snapshot."""
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_sides_are_sorted(self):
+        """Test bids come back descending and asks ascending."""
+        client = await make_client()
+        book = client.get_orderbook("a")
+        
+        assert levels(book.bids) == [("0.45", "5"), ("0.40", "10")]
+        assert levels(book.asks) == [("0.55", "3"), ("0.60", "7")]
+    
+    @pytest.mark.asyncio
+    async def test_insert_new_levels_in_order(self):
+        """Test new prices land in sorted position on either side."""
+        client = await make_client()
+        await client._handle_price_change(change("0.42", "8", "BUY"))
+        await client._handle_price_change(change("0.50", "1", "BUY"))
+        await client._handle_price_change(change("0.58", "2", "SELL"))
+        await client._handle_price_change(change("0.70", "4", "SELL"))
+        book = client.get_orderbook("a")
+        
+        assert levels(book.bids) == [("0.50", "1"), ("0.45", "5"), ("0.42", "8"), ("0.40", "10")]
+        assert levels(book.asks) == [("0.55", "3"), ("0.58", "2"), ("0.60", "7"), ("0.70", "4")]
+        assert book.best_bid == Decimal("0.50")
+    
+    @pytest.mark.asyncio
+    async def test_update_existing_level(self):
+        """Test a known price replaces the size in place."""
+        client = await make_client()
+        await client._handle_price_change(change("0.40", "25", "BUY"))
+        await client._handle_price_change(change("0.55", "9", "SELL"))
+        book = client.get_orderbook("a")
+        
+        assert levels(book.bids) == [("0.45", "5"), ("0.40", "25")]
+        assert levels(book.asks) == [("0.55", "9"), ("0.60", "7")]
+    
+    @pytest.mark.asyncio
+    async def test_zero_size_removes_level(self):
+        """Test size 0 deletes a level, and is ignored for unknown prices."""
+        client = await make_client()
+        await client._handle_price_change(change("0.45", "0", "BUY"))
+        await client._handle_price_change(change("0.65", "0", "SELL"))
+        book = client.get_orderbook("a")
+        
+        assert levels(book.bids) == [("0.40", "10")]
+        assert levels(book.asks) == [("0.55", "3"), ("0.60", "7")]
+    
+    @pytest.mark.asyncio
+    async def test_change_refreshes_cached_top_and_arrays(self):
+        """Test cached top of book and level arrays are rebuilt after a change."""
+        client = await make_client()
+        book = client.get_orderbook("a")
+        assert book.best_ask == Decimal("0.55")
+        assert book.level_arrays("asks")[0].tolist() == [0.55, 0.60]
+        
+        await client._handle_price_change(change("0.55", "0", "SELL"))
+        
+        assert book.best_ask == Decimal("0.60")
+        assert book.level_arrays("asks")[0].tolist() == [0.60]